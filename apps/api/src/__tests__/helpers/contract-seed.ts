@@ -0,0 +1,164 @@
+/**
+ * Deterministic Study in Kazakhstan seed for the API contract harness
+ *
+ * Fixed ids, slugs and timestamps so the public API returns byte-identical
+ * responses on every run. Mirrors the content types the website reads:
+ * universities, programs linked to a university, and the disciplines taxonomy.
+ */
+
+import type { DbClient } from '../../db/client';
+import {
+  organizations,
+  users,
+  postTypes,
+  customFields,
+  postTypeFields,
+  posts,
+  postFieldValues,
+  postRelationships,
+  taxonomies,
+  taxonomyTerms,
+  postTaxonomies,
+} from '../../db/schema';
+
+export const CONTRACT_ORG_SLUG = 'study-in-kazakhstan';
+
+const orgId = 'org_contract_sik';
+const authorId = 'user_contract_editor';
+const seededAt = new Date('2025-01-15T00:00:00Z');
+
+const universities = [
+  {
+    slug: 'coventry-university-kazakhstan',
+    title: 'Coventry University Kazakhstan',
+    excerpt: 'British higher education in Astana.',
+    content: '<p>Coventry University Kazakhstan offers UK degrees in Astana.</p>',
+    fields: { city: 'Astana', tuition_fee: 6500, founded_year: 2021 },
+  },
+  {
+    slug: 'nazarbayev-university',
+    title: 'Nazarbayev University',
+    excerpt: 'Research university in Astana.',
+    content: '<p>Nazarbayev University is an autonomous research university.</p>',
+    fields: { city: 'Astana', tuition_fee: 8000, founded_year: 2010 },
+  },
+  {
+    slug: 'al-farabi-kazakh-national-university',
+    title: 'Al-Farabi Kazakh National University',
+    excerpt: 'The largest university in Almaty.',
+    content: '<p>Al-Farabi Kazakh National University is located in Almaty.</p>',
+    fields: { city: 'Almaty', tuition_fee: 4200, founded_year: 1934 },
+  },
+];
+
+const programs = [
+  { slug: 'computer-science-bsc', title: 'Computer Science BSc', university: 'coventry-university-kazakhstan', discipline: 'computer-science', fields: { degree_level: 'Bachelor', duration_years: 3 } },
+  { slug: 'business-management-bsc', title: 'Business Management BSc', university: 'coventry-university-kazakhstan', discipline: 'business', fields: { degree_level: 'Bachelor', duration_years: 3 } },
+  { slug: 'engineering-management-msc', title: 'Engineering Management MSc', university: 'coventry-university-kazakhstan', discipline: 'engineering', fields: { degree_level: 'Master', duration_years: 1 } },
+  { slug: 'petroleum-engineering-beng', title: 'Petroleum Engineering BEng', university: 'nazarbayev-university', discipline: 'engineering', fields: { degree_level: 'Bachelor', duration_years: 4 } },
+];
+
+const disciplines = [
+  { slug: 'business', name: 'Business' },
+  { slug: 'computer-science', name: 'Computer Science' },
+  { slug: 'engineering', name: 'Engineering' },
+];
+
+const fields = [
+  { slug: 'city', name: 'City', fieldType: 'text', postType: 'universities' },
+  { slug: 'tuition_fee', name: 'Tuition Fee (USD)', fieldType: 'number', postType: 'universities' },
+  { slug: 'founded_year', name: 'Founded', fieldType: 'number', postType: 'universities' },
+  { slug: 'degree_level', name: 'Degree Level', fieldType: 'select', postType: 'programs' },
+  { slug: 'duration_years', name: 'Duration (years)', fieldType: 'number', postType: 'programs' },
+];
+
+const postId = (slug: string) => `post_contract_${slug}`;
+const fieldId = (slug: string) => `field_contract_${slug}`;
+const postTypeId = (slug: string) => `type_contract_${slug}`;
+const termId = (slug: string) => `term_contract_${slug}`;
+
+/**
+ * Insert the seed into an empty, migrated database
+ */
+export async function seedContractData(db: DbClient): Promise<void> {
+  const timestamps = { createdAt: seededAt, updatedAt: seededAt };
+
+  await db.insert(organizations).values({ id: orgId, name: 'Study in Kazakhstan', slug: CONTRACT_ORG_SLUG, ...timestamps });
+  await db.insert(users).values({ id: authorId, email: 'editor@study-in-kazakhstan.test', name: 'Contract Editor', ...timestamps });
+
+  await db.insert(postTypes).values([
+    { id: postTypeId('universities'), organizationId: orgId, name: 'Universities', slug: 'universities', ...timestamps },
+    { id: postTypeId('programs'), organizationId: orgId, name: 'Programs', slug: 'programs', ...timestamps },
+  ]);
+
+  await db.insert(customFields).values(fields.map((field) => ({
+    id: fieldId(field.slug),
+    organizationId: orgId,
+    name: field.name,
+    slug: field.slug,
+    fieldType: field.fieldType,
+    ...timestamps,
+  })));
+  await db.insert(postTypeFields).values(fields.map((field, order) => ({
+    id: `ptf_contract_${field.slug}`,
+    postTypeId: postTypeId(field.postType),
+    customFieldId: fieldId(field.slug),
+    order,
+    createdAt: seededAt,
+  })));
+
+  await db.insert(taxonomies).values({ id: 'tax_contract_disciplines', organizationId: orgId, name: 'Disciplines', slug: 'disciplines', ...timestamps });
+  await db.insert(taxonomyTerms).values(disciplines.map((term) => ({
+    id: termId(term.slug),
+    taxonomyId: 'tax_contract_disciplines',
+    name: term.name,
+    slug: term.slug,
+    ...timestamps,
+  })));
+
+  const postRows = [
+    ...universities.map((university) => ({ ...university, postType: 'universities' })),
+    ...programs.map((program) => ({
+      ...program,
+      postType: 'programs',
+      excerpt: `${program.title} at ${program.university}.`,
+      content: `<p>${program.title}</p>`,
+    })),
+  ];
+  for (const row of postRows) {
+    await db.insert(posts).values({
+      id: postId(row.slug),
+      organizationId: orgId,
+      postTypeId: postTypeId(row.postType),
+      authorId,
+      title: row.title,
+      slug: row.slug,
+      excerpt: row.excerpt,
+      content: row.content,
+      status: 'published',
+      publishedAt: seededAt,
+      ...timestamps,
+    });
+    await db.insert(postFieldValues).values(Object.entries(row.fields).map(([slug, value]) => ({
+      id: `pfv_contract_${row.slug}_${slug}`,
+      postId: postId(row.slug),
+      customFieldId: fieldId(slug),
+      value: JSON.stringify(value),
+      ...timestamps,
+    })));
+  }
+
+  await db.insert(postRelationships).values(programs.map((program) => ({
+    id: `rel_contract_${program.slug}`,
+    fromPostId: postId(program.slug),
+    toPostId: postId(program.university),
+    relationshipType: 'university',
+    createdAt: seededAt,
+  })));
+  await db.insert(postTaxonomies).values(programs.map((program) => ({
+    id: `ptx_contract_${program.slug}`,
+    postId: postId(program.slug),
+    taxonomyTermId: termId(program.discipline),
+    createdAt: seededAt,
+  })));
+}
@@ -19,11 +19,19 @@ export interface IntegrationD1Setup {
   mf: Miniflare;
 }
 
+/**
+ * Options for creating the integration D1 database
+ */
+export interface IntegrationD1Options {
+  /** Keep data in ./.wrangler/test-state between runs (default true); false gives an empty in-memory database */
+  persist?: boolean;
+}
+
 /**
  * Creates a real D1 database using Miniflare with migrations applied
  * Returns both the database and Miniflare instance for cleanup
  */
-export async function createIntegrationD1(): Promise<IntegrationD1Setup> {
+export async function createIntegrationD1(options: IntegrationD1Options = {}): Promise<IntegrationD1Setup> {
   // Create a minimal worker script that Miniflare can use
   const workerScript = `export default {
     async fetch() {
@@ -37,7 +45,7 @@ export async function createIntegrationD1(): Promise<IntegrationD1Setup> {
     d1Databases: ['DB'],
     // Use a separate database file for tests (isolated from dev database)
     // Persist D1 data to a test-specific directory
-    d1Persist: './.wrangler/test-state',
+    d1Persist: options.persist === false ? false : './.wrangler/test-state',
   });
 
   const d1 = await mf.getD1Database('DB');
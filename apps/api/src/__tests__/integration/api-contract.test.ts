@@ -0,0 +1,76 @@
+/**
+ * API contract recording
+ *
+ * Runs the Worker app in-process against an in-memory Miniflare D1 loaded
+ * with the deterministic contract seed, and requests every endpoint listed in
+ * docs/api/study-in-kazakhstan/contract/endpoints.json. When API_CONTRACT_DIR
+ * is set (`scripts/api-contract.py check` does this) each response is written
+ * to <API_CONTRACT_DIR>/fixtures for the offline baseline comparison.
+ */
+
+import { describe, it, expect, beforeAll, afterAll } from '@jest/globals';
+import { mkdirSync, readFileSync, writeFileSync } from 'fs';
+import { join, resolve, dirname } from 'path';
+import { fileURLToPath } from 'url';
+import type { Miniflare } from 'miniflare';
+import type { D1Database } from '@cloudflare/workers-types';
+import { createIntegrationD1, cleanupIntegrationD1 } from '../helpers/integration-d1';
+import { seedContractData, CONTRACT_ORG_SLUG } from '../helpers/contract-seed';
+import { getDb } from '../../db/client';
+import { QUERY_COUNT_HEADER } from '../../lib/api/server-timing';
+import app from '../../index';
+
+const __dirname = dirname(fileURLToPath(import.meta.url));
+
+const recordDir = process.env.API_CONTRACT_DIR;
+const contractDir = recordDir ?? resolve(__dirname, '../../../../../docs/api/study-in-kazakhstan/contract');
+const endpoints = JSON.parse(
+  readFileSync(join(contractDir, 'endpoints.json'), 'utf-8')
+) as Array<{ name: string; path: string }>;
+
+describe('Integration Tests - API contract', () => {
+  let d1: D1Database;
+  let mf: Miniflare | undefined;
+
+  beforeAll(async () => {
+    // In-memory database so the seed is the only data and responses are stable
+    const setup = await createIntegrationD1({ persist: false });
+    d1 = setup.db;
+    mf = setup.mf;
+    await seedContractData(getDb(d1));
+
+    if (recordDir) {
+      mkdirSync(join(recordDir, 'fixtures'), { recursive: true });
+    }
+  });
+
+  afterAll(async () => {
+    if (mf) {
+      await cleanupIntegrationD1(mf);
+    }
+  });
+
+  it.each(endpoints)('should serve $name from the seed', async ({ name, path }) => {
+    const res = await app.request(path.replace('{orgSlug}', CONTRACT_ORG_SLUG), {}, { DB: d1 } as any);
+    const text = await res.text();
+    const body = JSON.parse(text);
+
+    expect(res.status).toBe(200);
+    expect(body.success).toBe(true);
+    expect(res.headers.get(QUERY_COUNT_HEADER)).not.toBeNull();
+
+    if (recordDir) {
+      // Same fixture format as `api-contract.py record`; only the query count
+      // is kept from Server-Timing so fixtures don't change between runs
+      const fixture = {
+        name,
+        path,
+        status: res.status,
+        bytes: new TextEncoder().encode(text).length,
+        timing: { db_queries: Number(res.headers.get(QUERY_COUNT_HEADER)) },
+        body,
+      };
+      writeFileSync(join(recordDir, 'fixtures', `${name}.json`), `${JSON.stringify(fixture, null, 2)}\n`);
+    }
+  });
+});
@@ -0,0 +1,334 @@
+/**
+ * Integration tests for post presence and edit locks
+ *
+ * Runs the PostCollaboration Durable Object and the presence/lock routes
+ * against a real D1 database (Miniflare) with a fake Durable Object state.
+ */
+
+import { describe, it, expect, beforeAll, afterAll } from '@jest/globals';
+import type { Miniflare } from 'miniflare';
+import type { D1Database } from '@cloudflare/workers-types';
+import { and, eq } from 'drizzle-orm';
+import { createIntegrationD1, cleanupIntegrationD1 } from '../helpers/integration-d1';
+import { getDb, instrumentD1, createDbMetrics } from '../../db/client';
+import type { DbClient, DbMetrics } from '../../db/client';
+import { organizations, postTypes, posts, users, postEditLocks, presence } from '../../db/schema';
+import {
+  PostCollaboration,
+  PRESENCE_TIMEOUT_MS,
+  encodeCollaborationUser,
+  type CollaborationUser,
+} from '../../lib/collaboration/post-collaboration-object';
+import postPresenceRoutes from '../../routes/admin/post-presence';
+import postLockRoutes from '../../routes/admin/post-lock';
+
+const runId = Date.now().toString(36);
+let postCounter = 0;
+
+function createFakeState(sockets: any[] = []) {
+  const storage = new Map<string, unknown>();
+  let alarm: number | null = null;
+  return {
+    blockConcurrencyWhile: async <T>(fn: () => Promise<T>) => fn(),
+    storage: {
+      get: async (key: string) => storage.get(key),
+      put: async (key: string, value: unknown) => {
+        storage.set(key, structuredClone(value));
+      },
+      delete: async (key: string) => storage.delete(key),
+      getAlarm: async () => alarm,
+      setAlarm: async (time: number) => {
+        alarm = time;
+      },
+    },
+    getWebSockets: () => sockets,
+    acceptWebSocket: (ws: unknown) => sockets.push(ws),
+  } as any;
+}
+
+function createFakeSocket(user: CollaborationUser, lastSeenAt: number) {
+  let attachment: unknown = { user, lastSeenAt };
+  return {
+    sent: [] as string[],
+    closedWith: null as number | null,
+    deserializeAttachment: () => attachment,
+    serializeAttachment(value: unknown) {
+      attachment = value;
+    },
+    send(data: string) {
+      this.sent.push(data);
+    },
+    close(code: number) {
+      this.closedWith = code;
+    },
+  };
+}
+
+describe('Integration Tests - Post Collaboration', () => {
+  let d1: D1Database;
+  let db: DbClient;
+  let mf: Miniflare | undefined;
+
+  const orgId = `org_collab_${runId}`;
+  const otherOrgId = `org_collab_other_${runId}`;
+  const postTypeId = `pt_collab_${runId}`;
+  const alice: CollaborationUser = { id: `user_alice_${runId}`, name: 'Alice', email: `alice_${runId}@example.com`, avatarUrl: null };
+  const bob: CollaborationUser = { id: `user_bob_${runId}`, name: 'Bob', email: `bob_${runId}@example.com`, avatarUrl: null };
+
+  async function createPost(): Promise<string> {
+    const id = `post_collab_${runId}_${++postCounter}`;
+    await db.insert(posts).values({
+      id,
+      organizationId: orgId,
+      postTypeId,
+      authorId: alice.id,
+      title: 'Collaboration test',
+      slug: id,
+    });
+    return id;
+  }
+
+  function createObject(metrics: DbMetrics = createDbMetrics(), sockets: any[] = []) {
+    return new PostCollaboration(createFakeState(sockets), { DB: instrumentD1(d1, metrics) } as any);
+  }
+
+  function callObject(
+    object: PostCollaboration,
+    method: string,
+    path: string,
+    postId: string,
+    user: CollaborationUser,
+    organizationId = orgId
+  ) {
+    return object.fetch(new Request(`https://post-collaboration${path}`, {
+      method,
+      headers: {
+        'X-Post-Id': postId,
+        'X-Organization-Id': organizationId,
+        'X-Collaboration-User': encodeCollaborationUser(user),
+      },
+    }));
+  }
+
+  // Writes (not reads) against post_edit_locks
+  const lockWrites = (metrics: DbMetrics) =>
+    metrics.queries.filter((query) =>
+      /post_edit_locks/.test(query.sql) && /^\s*(insert|update|delete)/i.test(query.sql)
+    ).length;
+
+  beforeAll(async () => {
+    const setup = await createIntegrationD1();
+    d1 = setup.db;
+    mf = setup.mf;
+    db = getDb(d1);
+
+    await db.insert(organizations).values([
+      { id: orgId, name: 'Collaboration Org', slug: `collab-${runId}` },
+      { id: otherOrgId, name: 'Other Org', slug: `collab-other-${runId}` },
+    ]);
+    await db.insert(users).values([
+      { id: alice.id, email: alice.email, name: alice.name, isSuperAdmin: false },
+      { id: bob.id, email: bob.email, name: bob.name, isSuperAdmin: false },
+    ]);
+    await db.insert(postTypes).values({ id: postTypeId, organizationId: orgId, name: 'Page', slug: 'page' });
+  });
+
+  afterAll(async () => {
+    if (mf) {
+      await cleanupIntegrationD1(mf);
+    }
+  });
+
+  describe('PostCollaboration Durable Object', () => {
+    it('should only write D1 on lock acquire, takeover and release', async () => {
+      const postId = await createPost();
+      const metrics = createDbMetrics();
+      const object = createObject(metrics);
+
+      const acquired = await callObject(object, 'POST', '/lock', postId, alice);
+      expect(acquired.status).toBe(200);
+      expect((await acquired.json() as any).data.message).toBe('Lock acquired');
+      expect(lockWrites(metrics)).toBe(1);
+
+      // Refresh stays in Durable Object storage
+      const refreshed = await callObject(object, 'POST', '/lock', postId, alice);
+      expect((await refreshed.json() as any).data.message).toBe('Lock refreshed');
+      expect(lockWrites(metrics)).toBe(1);
+
+      // Another editor conflicts and cannot release it
+      const conflict = await callObject(object, 'POST', '/lock', postId, bob);
+      expect(conflict.status).toBe(409);
+      const status = await callObject(object, 'GET', '/lock', postId, bob);
+      expect((await status.json() as any).data).toMatchObject({ locked: true, lock: { userId: alice.id, isOwner: false } });
+      const forbidden = await callObject(object, 'DELETE', '/lock', postId, bob);
+      expect(forbidden.status).toBe(403);
+      expect(lockWrites(metrics)).toBe(1);
+
+      // Takeover replaces the D1 row
+      const takeover = await callObject(object, 'POST', '/lock/takeover', postId, bob);
+      expect((await takeover.json() as any).data.message).toBe('Lock taken over');
+      expect(lockWrites(metrics)).toBe(3);
+      const rows = await db.query.postEditLocks.findMany({ where: eq(postEditLocks.postId, postId) });
+      expect(rows.map((row) => row.userId)).toEqual([bob.id]);
+
+      const released = await callObject(object, 'DELETE', '/lock', postId, bob);
+      expect((await released.json() as any).data.message).toBe('Lock released');
+      expect(lockWrites(metrics)).toBe(4);
+      expect(await db.query.postEditLocks.findMany({ where: eq(postEditLocks.postId, postId) })).toHaveLength(0);
+    });
+
+    it('should grant the lock to exactly one of two concurrent acquires', async () => {
+      const postId = await createPost();
+      const object = createObject();
+
+      const responses = await Promise.all([
+        callObject(object, 'POST', '/lock', postId, alice),
+        callObject(object, 'POST', '/lock', postId, bob),
+      ]);
+
+      expect(responses.map((res) => res.status).sort()).toEqual([200, 409]);
+      const winner = responses[0].status === 200 ? alice : bob;
+      const rows = await db.query.postEditLocks.findMany({ where: eq(postEditLocks.postId, postId) });
+      expect(rows.map((row) => row.userId)).toEqual([winner.id]);
+    });
+
+    it('should accept users with non-Latin-1 names', async () => {
+      const postId = await createPost();
+      const object = createObject();
+      const aigerim: CollaborationUser = { ...alice, name: 'Айгерим' };
+
+      const acquired = await callObject(object, 'POST', '/lock', postId, aigerim);
+      expect(acquired.status).toBe(200);
+      const status = await callObject(object, 'GET', '/lock', postId, bob);
+      expect((await status.json() as any).data.lock.userName).toBe('Айгерим');
+    });
+
+    it('should return 404 when the post belongs to another organization', async () => {
+      const postId = await createPost();
+      const object = createObject();
+
+      const res = await callObject(object, 'GET', '/lock', postId, alice, otherOrgId);
+      expect(res.status).toBe(404);
+    });
+
+    it('should drop and close sockets that stopped sending heartbeats', async () => {
+      const postId = await createPost();
+      const stale = createFakeSocket(alice, Date.now() - PRESENCE_TIMEOUT_MS - 1000);
+      const live = createFakeSocket(bob, Date.now());
+      const object = createObject(createDbMetrics(), [stale, live]);
+
+      const res = await callObject(object, 'GET', '/presence', postId, bob);
+      const { activeUsers } = (await res.json() as any).data;
+      expect(activeUsers.map((user: { id: string }) => user.id)).toEqual([bob.id]);
+
+      await object.alarm();
+
+      expect(stale.closedWith).not.toBeNull();
+      expect(live.closedWith).toBeNull();
+      expect(stale.sent).toHaveLength(0);
+      const presenceMessage = JSON.parse(live.sent[live.sent.length - 1]);
+      expect(presenceMessage.type).toBe('presence');
+      expect(presenceMessage.activeUsers.map((user: { id: string }) => user.id)).toEqual([bob.id]);
+    });
+  });
+
+  describe('Presence and lock routes', () => {
+    const env = () => ({ DB: d1, ENABLE_LOCAL_AUTH_BYPASS: 'true' } as any);
+
+    it('should forward to the Durable Object when it is configured', async () => {
+      const postId = await createPost();
+      const forwarded: Request[] = [];
+      const namespace = {
+        idFromName: (name: string) => name,
+        get: () => ({
+          fetch: async (url: string, init: RequestInit) => {
+            forwarded.push(new Request(url, init));
+            return Response.json({ success: true, data: { forwarded: true } });
+          },
+        }),
+      };
+
+      const presenceRes = await postPresenceRoutes.request(
+        `/${orgId}/posts/${postId}/presence`,
+        { method: 'POST' },
+        { ...env(), POST_COLLABORATION: namespace }
+      );
+      const lockRes = await postLockRoutes.request(
+        `/${orgId}/posts/${postId}/lock`,
+        { method: 'POST' },
+        { ...env(), POST_COLLABORATION: namespace }
+      );
+
+      expect((await presenceRes.json() as any).data.forwarded).toBe(true);
+      expect((await lockRes.json() as any).data.forwarded).toBe(true);
+      expect(forwarded.map((request) => new URL(request.url).pathname)).toEqual(['/presence', '/lock']);
+      expect(forwarded[0].headers.get('X-Post-Id')).toBe(postId);
+      expect(forwarded[0].headers.get('X-Organization-Id')).toBe(orgId);
+
+      // Nothing written to D1 by the route itself
+      expect(await db.query.presence.findMany({ where: eq(presence.postId, postId) })).toHaveLength(0);
+      expect(await db.query.postEditLocks.findMany({ where: eq(postEditLocks.postId, postId) })).toHaveLength(0);
+    });
+
+    it('should forward users with non-Latin-1 names to the Durable Object', async () => {
+      const postId = await createPost();
+      const object = createObject();
+      const namespace = {
+        idFromName: (name: string) => name,
+        get: () => ({
+          fetch: (url: string, init: RequestInit) => object.fetch(new Request(url, init)),
+        }),
+      };
+
+      // The auth bypass creates the demo user on its first request
+      await postPresenceRoutes.request(`/${orgId}/posts/${postId}/presence`, {}, env());
+      await db.update(users).set({ name: 'Айгерим' }).where(eq(users.email, 'demo@example.com'));
+      try {
+        const acquired = await postLockRoutes.request(
+          `/${orgId}/posts/${postId}/lock`,
+          { method: 'POST' },
+          { ...env(), POST_COLLABORATION: namespace }
+        );
+        expect(acquired.status).toBe(200);
+
+        const status = await postLockRoutes.request(
+          `/${orgId}/posts/${postId}/lock`,
+          {},
+          { ...env(), POST_COLLABORATION: namespace }
+        );
+        expect((await status.json() as any).data.lock).toMatchObject({ userName: 'Айгерим', isOwner: true });
+      } finally {
+        await db.update(users).set({ name: 'Demo User' }).where(eq(users.email, 'demo@example.com'));
+      }
+    });
+
+    it('should fall back to D1 and resolve users in the presence query', async () => {
+      const postId = await createPost();
+
+      const heartbeat = await postPresenceRoutes.request(
+        `/${orgId}/posts/${postId}/presence`,
+        { method: 'POST' },
+        env()
+      );
+      expect(heartbeat.status).toBe(200);
+
+      const res = await postPresenceRoutes.request(`/${orgId}/posts/${postId}/presence`, {}, env());
+      const { activeUsers } = (await res.json() as any).data;
+
+      expect(activeUsers).toHaveLength(1);
+      expect(activeUsers[0]).toMatchObject({ name: 'Demo User', email: 'demo@example.com' });
+
+      const rows = await db.query.presence.findMany({
+        where: and(eq(presence.postId, postId), eq(presence.userId, activeUsers[0].id)),
+      });
+      expect(rows).toHaveLength(1);
+    });
+
+    it('should return 404 from the D1 fallback for posts in another organization', async () => {
+      const postId = await createPost();
+
+      const res = await postPresenceRoutes.request(`/${otherOrgId}/posts/${postId}/presence`, {}, env());
+      expect(res.status).toBe(404);
+    });
+  });
+});
@@ -0,0 +1,151 @@
+import { describe, it, expect, jest, afterEach } from '@jest/globals';
+import { Hono } from 'hono';
+import {
+  computePhases,
+  formatServerTiming,
+  serverTimingMiddleware,
+  QUERY_COUNT_HEADER,
+} from '../../lib/api/server-timing';
+import { createDbMetrics, instrumentD1 } from '../../db/client';
+import mediaRoutes from '../../routes/public/media';
+
+function createFakeD1() {
+  const batches: unknown[][] = [];
+  const statement = (sql: string): any => ({
+    sql,
+    bind: (...params: unknown[]) => ({ ...statement(sql), params }),
+    all: async () => ({ results: [], success: true }),
+    first: async () => null,
+    run: async () => ({ success: true }),
+    raw: async () => [],
+  });
+  const d1: any = {
+    prepare: (sql: string) => statement(sql),
+    batch: async (statements: unknown[]) => {
+      batches.push(statements);
+      return statements.map(() => ({ results: [], success: true }));
+    },
+    exec: async () => ({ count: 0, duration: 0 }),
+  };
+  return { d1, batches };
+}
+
+describe('Performance - Server-Timing', () => {
+  describe('instrumentD1', () => {
+    it('should count every executed statement', async () => {
+      const { d1 } = createFakeD1();
+      const metrics = createDbMetrics();
+      const db = instrumentD1(d1, metrics);
+
+      await db.prepare('select 1').all();
+      await db.prepare('select * from posts where id = ?').bind('p1').first();
+      db.prepare('not executed');
+
+      expect(metrics.queryCount).toBe(2);
+      expect(metrics.queries.map((query) => query.sql)).toEqual([
+        'select 1',
+        'select * from posts where id = ?',
+      ]);
+    });
+
+    it('should pass unwrapped statements to batch and count each one', async () => {
+      const { d1, batches } = createFakeD1();
+      const metrics = createDbMetrics();
+      const db = instrumentD1(d1, metrics);
+
+      const statements = [db.prepare('insert 1').bind(1), db.prepare('insert 2').bind(2)];
+      await db.batch(statements);
+
+      expect(metrics.queryCount).toBe(2);
+      expect(batches[0]).not.toContain(statements[0]);
+      expect((batches[0][0] as any).params).toEqual([1]);
+    });
+  });
+
+  describe('serverTimingMiddleware', () => {
+    function createApp() {
+      const app = new Hono<any>();
+      app.use('*', serverTimingMiddleware);
+      app.get('/posts', async (c) => {
+        await c.env.DB.prepare('select * from posts').all();
+        await c.env.DB.prepare('select * from post_field_values').all();
+        return c.json({ success: true, data: [] });
+      });
+      app.route('/', mediaRoutes);
+      return app;
+    }
+
+    afterEach(() => {
+      delete (globalThis as any).caches;
+      jest.restoreAllMocks();
+    });
+
+    it('should report the query count of every D1 call made by the route', async () => {
+      const { d1 } = createFakeD1();
+
+      const res = await createApp().request('/posts', {}, { DB: d1 });
+
+      expect(res.status).toBe(200);
+      expect(res.headers.get(QUERY_COUNT_HEADER)).toBe('2');
+      expect(res.headers.get('Server-Timing')).toMatch(/^db;dur=[\d.]+;desc="2 queries", hydrate;dur=[\d.]+, serialize;dur=[\d.]+, total;dur=[\d.]+$/);
+    });
+
+    it('should re-wrap responses with immutable headers, such as Cache API hits', async () => {
+      // Responses from cache.match() cannot be modified in Workers
+      const cached = new Response('cached body', { status: 200, headers: { 'Content-Type': 'image/png' } });
+      const immutable = () => {
+        throw new TypeError("Can't modify immutable headers.");
+      };
+      cached.headers.append = immutable;
+      cached.headers.set = immutable;
+      (globalThis as any).caches = { default: { match: async () => cached } };
+
+      const res = await createApp().request('http://localhost/media/logo.png', {}, { R2_BUCKET: {} });
+
+      expect(res.status).toBe(200);
+      expect(res.headers.get('Content-Type')).toBe('image/png');
+      expect(res.headers.get(QUERY_COUNT_HEADER)).toBe('0');
+      expect(res.headers.get('Server-Timing')).toContain('desc="0 queries"');
+      expect(await res.text()).toBe('cached body');
+    });
+
+    it('should log sampled slow requests with their slowest queries', async () => {
+      const warn = jest.spyOn(console, 'warn').mockImplementation(() => {});
+      const { d1 } = createFakeD1();
+
+      await createApp().request('/posts', {}, { DB: d1, SLOW_REQUEST_MS: '0', SLOW_REQUEST_SAMPLE_RATE: '1' });
+
+      expect(warn).toHaveBeenCalledTimes(1);
+      const [label, payload] = warn.mock.calls[0] as [string, string];
+      expect(label).toBe('[SLOW_REQUEST]');
+      expect(JSON.parse(payload)).toMatchObject({ method: 'GET', path: '/posts', status: 200, queryCount: 2 });
+      expect(JSON.parse(payload).topQueries).toHaveLength(2);
+    });
+
+    it('should not log slow requests outside the sample rate or under the threshold', async () => {
+      const warn = jest.spyOn(console, 'warn').mockImplementation(() => {});
+      const { d1 } = createFakeD1();
+      const app = createApp();
+
+      await app.request('/posts', {}, { DB: d1, SLOW_REQUEST_MS: '0', SLOW_REQUEST_SAMPLE_RATE: '0' });
+      await app.request('/posts', {}, { DB: d1, SLOW_REQUEST_MS: '60000', SLOW_REQUEST_SAMPLE_RATE: '1' });
+
+      expect(warn).not.toHaveBeenCalled();
+    });
+  });
+
+  describe('formatServerTiming', () => {
+    it('should report db, hydrate, serialize and total phases', () => {
+      const metrics = { db: { queryCount: 3, durationMs: 12.34, queries: [] }, serializeMs: 1.06 };
+      const header = formatServerTiming(computePhases(metrics, 20));
+
+      expect(header).toBe('db;dur=12.3;desc="3 queries", hydrate;dur=6.6, serialize;dur=1.1, total;dur=20');
+    });
+
+    it('should never report a negative hydrate phase', () => {
+      const metrics = { db: { queryCount: 1, durationMs: 5, queries: [] }, serializeMs: 0 };
+
+      expect(computePhases(metrics, 4).hydrateMs).toBe(0);
+    });
+  });
+});
@@ -0,0 +1,153 @@
+import { describe, it, expect, beforeEach, jest } from '@jest/globals';
+import { makeExecutableSchema } from '@graphql-tools/schema';
+import { parse } from 'graphql';
+import { typeDefs } from '../../../lib/graphql/schema';
+import { BatchLoader } from '../../../lib/graphql/loaders';
+import { analyzeQueryComplexity, checkQueryComplexity, MAX_LIST_LIMIT } from '../../../lib/graphql/complexity';
+import { resolvers } from '../../../lib/graphql/resolvers';
+import { getCompiledQuery, hashQuery, clearPersistedQueries } from '../../../lib/graphql/persisted-queries';
+
+describe('Admin API - GraphQL', () => {
+  const schema = makeExecutableSchema({ typeDefs });
+
+  describe('BatchLoader', () => {
+    it('should batch loads made in the same tick into one call', async () => {
+      const batchFn = jest.fn(async (keys: string[]) =>
+        new Map(keys.map((key) => [key, { id: key }]))
+      );
+      const loader = new BatchLoader(batchFn);
+
+      const results = await Promise.all([loader.load('a'), loader.load('b'), loader.load('a')]);
+
+      expect(batchFn).toHaveBeenCalledTimes(1);
+      expect(batchFn).toHaveBeenCalledWith(['a', 'b']);
+      expect(results).toEqual([{ id: 'a' }, { id: 'b' }, { id: 'a' }]);
+    });
+
+    it('should resolve missing keys to null and serve primed values from cache', async () => {
+      const batchFn = jest.fn(async (_keys: string[]) => new Map<string, { id: string }>());
+      const loader = new BatchLoader(batchFn);
+      loader.prime('primed', { id: 'primed' });
+
+      expect(await loader.load('primed')).toEqual({ id: 'primed' });
+      expect(await loader.load('missing')).toBeNull();
+      expect(batchFn).toHaveBeenCalledWith(['missing']);
+    });
+  });
+
+  describe('Query complexity', () => {
+    it('should compute depth and list-multiplied cost', () => {
+      const document = parse(`
+        query {
+          posts(organizationId: "org", limit: 10) {
+            id
+            author { name }
+          }
+        }
+      `);
+
+      expect(analyzeQueryComplexity(schema, document)).toEqual({ depth: 3, cost: 1 + 10 * (1 + 2), errors: [] });
+    });
+
+    it('should resolve limit from variables', () => {
+      const document = parse(`
+        query Posts($limit: Int) {
+          posts(organizationId: "org", limit: $limit) { id }
+        }
+      `);
+
+      expect(analyzeQueryComplexity(schema, document, 'Posts', { limit: 5 })?.cost).toBe(6);
+    });
+
+    it('should reject queries over the cost limit', () => {
+      const document = parse(`
+        query {
+          taxonomies(organizationId: "org") { terms { id name } }
+        }
+      `);
+
+      expect(checkQueryComplexity(schema, document, null, undefined, { maxCost: 10 })).toMatch(/cost/);
+      expect(checkQueryComplexity(schema, document, null, undefined, { maxDepth: 1 })).toMatch(/depth/);
+      expect(checkQueryComplexity(schema, document)).toBeNull();
+    });
+
+    it('should reject zero and negative limits', () => {
+      for (const limit of [0, -1]) {
+        const document = parse(`
+          query {
+            posts(organizationId: "org", limit: ${limit}) { id author { name } }
+          }
+        `);
+
+        expect(checkQueryComplexity(schema, document)).toMatch(/limit must be a positive integer/);
+      }
+
+      const document = parse(`
+        query Posts($limit: Int) {
+          posts(organizationId: "org", limit: $limit) { id }
+        }
+      `);
+      expect(checkQueryComplexity(schema, document, 'Posts', { limit: -1 })).toMatch(/positive integer/);
+    });
+
+    it('should cost unsupplied variables at their default value, capped', () => {
+      const document = parse(`
+        query Posts($limit: Int = 100000) {
+          posts(organizationId: "org", limit: $limit) { id }
+        }
+      `);
+
+      expect(analyzeQueryComplexity(schema, document, 'Posts')?.cost).toBe(1 + MAX_LIST_LIMIT);
+      expect(analyzeQueryComplexity(schema, document, 'Posts', { limit: 3 })?.cost).toBe(4);
+    });
+
+    it('should execute the same clamped limit the cost model charged for', async () => {
+      const findMany = jest.fn(async (_options: any) => []);
+      const context: any = {
+        db: { query: { posts: { findMany }, media: { findMany } } },
+        loaders: { posts: { prime: jest.fn() }, media: { prime: jest.fn() } },
+      };
+
+      await resolvers.Query.posts(null, { organizationId: 'org', limit: 100000 }, context);
+      await resolvers.Query.media(null, { organizationId: 'org' }, context);
+
+      expect(findMany.mock.calls[0][0].limit).toBe(MAX_LIST_LIMIT);
+      expect(findMany.mock.calls[1][0].limit).toBe(20);
+      await expect(
+        resolvers.Query.posts(null, { organizationId: 'org', limit: -1 }, context)
+      ).rejects.toThrow(/positive integer/);
+    });
+  });
+
+  describe('Persisted queries', () => {
+    beforeEach(() => {
+      clearPersistedQueries();
+    });
+
+    it('should register a query and serve it by hash', async () => {
+      const query = 'query { postTypes(organizationId: "org") { id } }';
+      const hash = await hashQuery(query);
+
+      const first = await getCompiledQuery(schema, query, { version: 1, sha256Hash: hash });
+      expect(first.ok).toBe(true);
+
+      const second = await getCompiledQuery(schema, undefined, { version: 1, sha256Hash: hash });
+      expect(second.ok).toBe(true);
+    });
+
+    it('should report unknown hashes and mismatched hashes', async () => {
+      const notFound = await getCompiledQuery(schema, undefined, { sha256Hash: 'unknown' });
+      expect(notFound).toMatchObject({ ok: false, code: 'PERSISTED_QUERY_NOT_FOUND' });
+
+      const mismatch = await getCompiledQuery(schema, 'query { postTypes(organizationId: "org") { id } }', {
+        sha256Hash: 'deadbeef',
+      });
+      expect(mismatch).toMatchObject({ ok: false, code: 'PERSISTED_QUERY_HASH_MISMATCH' });
+    });
+
+    it('should reject documents that fail validation', async () => {
+      const result = await getCompiledQuery(schema, 'query { notAField }');
+      expect(result).toMatchObject({ ok: false, code: 'GRAPHQL_VALIDATION_FAILED' });
+    });
+  });
+});
@@ -0,0 +1,305 @@
+import { describe, it, expect, jest } from '@jest/globals';
+import { createMockDb } from '../../helpers/mock-db';
+import {
+  batchGetPostsSchema,
+  batchUpsertPostsSchema,
+  MAX_POST_BATCH_SIZE,
+} from '../../../lib/validations/post';
+import { batchGetPosts, batchUpsertPosts } from '../../../lib/batch/post-batch-manager';
+import { invalidatePostsCache } from '../../../lib/cache/invalidation';
+import {
+  posts,
+  postTypes,
+  customFields,
+  postFieldValues,
+  postTaxonomies,
+  taxonomyTerms,
+  media,
+} from '../../../db/schema';
+
+interface RecordedWrite {
+  op: 'insert' | 'update' | 'delete';
+  table: unknown;
+  values?: any;
+}
+
+/**
+ * Mock database for the batch manager: selects return every fixture row of
+ * the table (the manager maps results by id/slug itself) and writes are recorded
+ */
+function createBatchDb(rows: Map<unknown, any[]>) {
+  const db = createMockDb();
+  const writes: RecordedWrite[] = [];
+
+  db.select = () => ({
+    from: (table: unknown) => ({
+      where: () => ({ op: 'select', table }),
+    }),
+  });
+  db.insert = (table: unknown) => ({
+    values: (values: any) => {
+      const statement: any = { op: 'insert', table, values };
+      statement.onConflictDoUpdate = () => statement;
+      return statement;
+    },
+  });
+  db.update = (table: unknown) => ({
+    set: (values: any) => ({ where: () => ({ op: 'update', table, values }) }),
+  });
+  db.delete = (table: unknown) => ({
+    where: () => ({ op: 'delete', table }),
+  });
+  db.batch = jest.fn(async (statements: any[]) =>
+    statements.map((statement) => {
+      if (statement.op === 'select') {
+        return rows.get(statement.table) ?? [];
+      }
+      writes.push(statement);
+      return [];
+    })
+  );
+
+  return { db, writes };
+}
+
+const orgId = 'org_test_123';
+
+function createPost(overrides: Record<string, unknown>) {
+  return {
+    organizationId: orgId,
+    postTypeId: 'type_universities',
+    authorId: 'user_test_123',
+    title: 'Post',
+    status: 'draft',
+    publishedAt: null,
+    ...overrides,
+  };
+}
+
+describe('Admin API - Posts batch', () => {
+  describe('POST /api/admin/v1/organizations/:orgId/posts:batchGet', () => {
+    it('should accept ids and slugs', () => {
+      const result = batchGetPostsSchema.safeParse({
+        ids: ['post_1', 'post_2'],
+        slugs: ['nazarbayev-university'],
+        postTypeId: 'type_universities',
+      });
+
+      expect(result.success).toBe(true);
+    });
+
+    it('should reject empty requests', () => {
+      expect(batchGetPostsSchema.safeParse({}).success).toBe(false);
+      expect(batchGetPostsSchema.safeParse({ ids: [] }).success).toBe(false);
+    });
+
+    it('should reject batches over the size limit', () => {
+      const ids = Array.from({ length: MAX_POST_BATCH_SIZE }, (_, i) => `post_${i}`);
+
+      expect(batchGetPostsSchema.safeParse({ ids }).success).toBe(true);
+      expect(batchGetPostsSchema.safeParse({ ids, slugs: ['one-more'] }).success).toBe(false);
+    });
+  });
+
+  describe('POST /api/admin/v1/organizations/:orgId/posts:batchUpsert', () => {
+    it('should accept items matched by id or by post type and slug', () => {
+      const result = batchUpsertPostsSchema.safeParse({
+        items: [
+          { id: 'post_1', customFields: { tuition_fee: 5000 } },
+          {
+            postTypeId: 'type_programs',
+            slug: 'computer-science',
+            title: 'Computer Science',
+            status: 'published',
+            taxonomies: { tax_degree: ['term_bachelor'] },
+          },
+        ],
+      });
+
+      expect(result.success).toBe(true);
+    });
+
+    it('should not default status for partial updates', () => {
+      const result = batchUpsertPostsSchema.parse({ items: [{ id: 'post_1', title: 'Renamed' }] });
+
+      expect(result.items[0].status).toBeUndefined();
+    });
+
+    it('should reject items without an id or post type and slug', () => {
+      expect(batchUpsertPostsSchema.safeParse({ items: [{ slug: 'orphan', title: 'Orphan' }] }).success).toBe(false);
+      expect(batchUpsertPostsSchema.safeParse({ items: [] }).success).toBe(false);
+    });
+  });
+
+  describe('batchGetPosts', () => {
+    it('should return posts with field values and taxonomies, and report missing keys', async () => {
+      const { db } = createBatchDb(new Map<unknown, any[]>([
+        [posts, [createPost({ id: 'post_1', slug: 'nazarbayev-university' })]],
+        [postFieldValues, [{ id: 'fv_1', postId: 'post_1', customFieldId: 'field_fee', value: '5000' }]],
+        [postTaxonomies, [{ id: 'pt_1', postId: 'post_1', taxonomyTermId: 'term_city' }]],
+      ]));
+
+      const results = await batchGetPosts(db, orgId, { ids: ['post_1', 'post_missing'] });
+
+      expect(results[0]).toMatchObject({ key: 'post_1', found: true });
+      expect(results[0].post?.fieldValues).toHaveLength(1);
+      expect(results[0].post?.taxonomies).toHaveLength(1);
+      expect(results[1]).toEqual({ key: 'post_missing', keyType: 'id', found: false });
+      // Posts, then field values and taxonomies: two round-trips in total
+      expect(db.batch).toHaveBeenCalledTimes(2);
+    });
+
+    it('should flag slugs shared by several post types as ambiguous', async () => {
+      const { db } = createBatchDb(new Map<unknown, any[]>([
+        [posts, [
+          createPost({ id: 'post_1', slug: 'almaty', postTypeId: 'type_universities' }),
+          createPost({ id: 'post_2', slug: 'almaty', postTypeId: 'type_cities' }),
+        ]],
+      ]));
+
+      const [result] = await batchGetPosts(db, orgId, { slugs: ['almaty'] });
+
+      expect(result.found).toBe(false);
+      expect(result.error).toMatch(/specify postTypeId/);
+    });
+  });
+
+  describe('batchUpsertPosts', () => {
+    const fixtureRows = () => new Map<unknown, any[]>([
+      [posts, [
+        createPost({ id: 'post_1', slug: 'coventry' }),
+        createPost({ id: 'post_2', slug: 'nazarbayev' }),
+      ]],
+      [postTypes, [{ id: 'type_universities' }, { id: 'type_programs' }]],
+      [customFields, [{ id: 'field_fee', slug: 'tuition_fee' }]],
+      // Only this organization's rows; the lookups filter by organization
+      [taxonomyTerms, [{ id: 'term_bachelor' }, { id: 'term_master' }]],
+      [media, [{ id: 'media_logo' }]],
+    ]);
+
+    it('should create and update posts in one write batch', async () => {
+      const { db, writes } = createBatchDb(fixtureRows());
+
+      const { results } = await batchUpsertPosts(db, orgId, 'user_test_123', [
+        { id: 'post_1', title: 'Coventry University', customFields: { tuition_fee: 5000 } },
+        { postTypeId: 'type_programs', slug: 'computer-science', title: 'Computer Science' },
+      ]);
+
+      expect(results.map((result) => result.status)).toEqual(['updated', 'created']);
+      expect(writes.filter((write) => write.table === posts).map((write) => write.op)).toEqual(['update', 'insert']);
+      const fieldValues = writes.find((write) => write.table === postFieldValues);
+      expect(fieldValues?.values).toEqual([expect.objectContaining({ postId: 'post_1', customFieldId: 'field_fee', value: '5000' })]);
+    });
+
+    it('should reject duplicate items within a batch', async () => {
+      const { db } = createBatchDb(fixtureRows());
+
+      const { results } = await batchUpsertPosts(db, orgId, 'user_test_123', [
+        { postTypeId: 'type_programs', slug: 'law', title: 'Law' },
+        { postTypeId: 'type_programs', slug: 'law', title: 'Law (again)' },
+      ]);
+
+      expect(results[0].status).toBe('created');
+      expect(results[1]).toMatchObject({ status: 'error', error: 'Duplicate item in batch' });
+    });
+
+    it('should reject slug changes that collide with another post', async () => {
+      const { db, writes } = createBatchDb(fixtureRows());
+
+      const { results } = await batchUpsertPosts(db, orgId, 'user_test_123', [
+        { id: 'post_1', slug: 'nazarbayev' },
+      ]);
+
+      expect(results[0]).toMatchObject({ status: 'error', error: 'Post with this slug already exists for this post type' });
+      expect(writes).toHaveLength(0);
+    });
+
+    it('should reject unknown custom fields', async () => {
+      const { db } = createBatchDb(fixtureRows());
+
+      const { results } = await batchUpsertPosts(db, orgId, 'user_test_123', [
+        { id: 'post_1', customFields: { tuition_fee: 1, no_such_field: 2 } },
+      ]);
+
+      expect(results[0]).toMatchObject({ status: 'error', error: 'Unknown custom fields: no_such_field' });
+    });
+
+    it('should report unknown or foreign-organization references per item', async () => {
+      const { db, writes } = createBatchDb(fixtureRows());
+
+      const { results } = await batchUpsertPosts(db, orgId, 'user_test_123', [
+        { id: 'post_1', taxonomies: { tax_degree: ['term_bachelor', 'term_other_org'] } },
+        { id: 'post_2', featuredImageId: 'media_logo', ogImageId: 'media_missing' },
+        { postTypeId: 'type_programs', slug: 'law', title: 'Law', parentId: 'post_missing' },
+        {
+          postTypeId: 'type_programs',
+          slug: 'medicine',
+          title: 'Medicine',
+          parentId: 'post_1',
+          featuredImageId: 'media_logo',
+          taxonomies: { tax_degree: ['term_master'] },
+        },
+      ]);
+
+      expect(results[0]).toMatchObject({ status: 'error', error: 'Unknown taxonomy terms: term_other_org' });
+      expect(results[1]).toMatchObject({ status: 'error', error: 'Media not found: media_missing' });
+      expect(results[2]).toMatchObject({ status: 'error', error: 'Parent post not found' });
+      expect(results[3].status).toBe('created');
+
+      // Only the valid item reaches the write batch
+      expect(writes.filter((write) => write.table === posts).map((write) => write.op)).toEqual(['insert']);
+      const links = writes.find((write) => write.op === 'insert' && write.table === postTaxonomies);
+      expect(links?.values).toEqual([expect.objectContaining({ postId: results[3].id, taxonomyTermId: 'term_master' })]);
+    });
+
+    it('should never move an existing post to another post type', async () => {
+      const { db, writes } = createBatchDb(fixtureRows());
+
+      const { results } = await batchUpsertPosts(db, orgId, 'user_test_123', [
+        { id: 'post_1', postTypeId: 'type_programs', title: 'Moved' },
+        { id: 'post_2', postTypeId: 'type_universities', title: 'Same type' },
+        { postTypeId: 'type_foreign', slug: 'new-post', title: 'New' },
+      ]);
+
+      expect(results[0]).toMatchObject({ status: 'error', error: 'Post type cannot be changed in a batch upsert' });
+      expect(results[1].status).toBe('updated');
+      expect(results[2]).toMatchObject({ status: 'error', error: 'Post type not found' });
+
+      const [update] = writes.filter((write) => write.table === posts);
+      expect(update.op).toBe('update');
+      expect(update.values).not.toHaveProperty('postTypeId');
+    });
+  });
+
+  describe('invalidatePostsCache', () => {
+    it('should delete the list and each post detail key once', async () => {
+      const deleted: string[] = [];
+      (globalThis as any).caches = {
+        default: {
+          delete: async (request: Request) => {
+            deleted.push(request.url);
+            return true;
+          },
+        },
+      };
+
+      try {
+        const removed = await invalidatePostsCache(
+          'study-in-kazakhstan',
+          ['post_1', 'coventry', 'post_1'],
+          null,
+          'https://api.example.com'
+        );
+
+        expect(removed).toBe(3);
+        expect(deleted).toEqual([
+          'https://api.example.com/api/public/v1/study-in-kazakhstan/posts',
+          'https://api.example.com/api/public/v1/study-in-kazakhstan/posts/post_1',
+          'https://api.example.com/api/public/v1/study-in-kazakhstan/posts/coventry',
+        ]);
+      } finally {
+        delete (globalThis as any).caches;
+      }
+    });
+  });
+});
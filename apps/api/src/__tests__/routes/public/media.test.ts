@@ -0,0 +1,190 @@
+import { describe, it, expect, beforeEach, afterEach } from '@jest/globals';
+import { parseRangeHeader, isIfRangeSatisfied, formatContentRange } from '../../../lib/media/range';
+import mediaRoutes from '../../../routes/public/media';
+
+describe('Public API - Media', () => {
+  describe('Range header parsing', () => {
+    it('should parse a bounded byte range', () => {
+      expect(parseRangeHeader('bytes=0-99', 1000)).toEqual({
+        type: 'range',
+        range: { start: 0, end: 99 },
+      });
+    });
+
+    it('should parse open-ended and suffix ranges', () => {
+      expect(parseRangeHeader('bytes=900-', 1000)).toEqual({
+        type: 'range',
+        range: { start: 900, end: 999 },
+      });
+      expect(parseRangeHeader('bytes=-100', 1000)).toEqual({
+        type: 'range',
+        range: { start: 900, end: 999 },
+      });
+    });
+
+    it('should clamp the end of a range to the object size', () => {
+      expect(parseRangeHeader('bytes=500-5000', 1000)).toEqual({
+        type: 'range',
+        range: { start: 500, end: 999 },
+      });
+    });
+
+    it('should reject multi-range requests', () => {
+      expect(parseRangeHeader('bytes=0-1,5-6', 1000)).toEqual({ type: 'multiple' });
+    });
+
+    it('should report ranges starting past the end as unsatisfiable', () => {
+      expect(parseRangeHeader('bytes=1000-', 1000)).toEqual({ type: 'unsatisfiable' });
+    });
+
+    it('should ignore missing or malformed headers', () => {
+      expect(parseRangeHeader(undefined, 1000)).toEqual({ type: 'none' });
+      expect(parseRangeHeader('items=0-1', 1000)).toEqual({ type: 'none' });
+      expect(parseRangeHeader('bytes=50-10', 1000)).toEqual({ type: 'none' });
+    });
+  });
+
+  describe('If-Range handling', () => {
+    const uploaded = new Date('2024-01-01T00:00:00Z');
+
+    it('should honor the range when the strong ETag matches', () => {
+      expect(isIfRangeSatisfied('"abc"', { httpEtag: '"abc"', uploaded })).toBe(true);
+      expect(isIfRangeSatisfied('"def"', { httpEtag: '"abc"', uploaded })).toBe(false);
+    });
+
+    it('should never match weak ETags', () => {
+      expect(isIfRangeSatisfied('W/"abc"', { httpEtag: 'W/"abc"', uploaded })).toBe(false);
+    });
+
+    it('should match on Last-Modified date', () => {
+      expect(isIfRangeSatisfied(uploaded.toUTCString(), { uploaded })).toBe(true);
+      expect(isIfRangeSatisfied(new Date('2023-01-01').toUTCString(), { uploaded })).toBe(false);
+    });
+  });
+
+  describe('Content-Range formatting', () => {
+    it('should format satisfied and unsatisfied ranges', () => {
+      expect(formatContentRange({ start: 0, end: 9 }, 100)).toBe('bytes 0-9/100');
+      expect(formatContentRange(null, 100)).toBe('bytes */100');
+    });
+  });
+
+  describe('Cache API population', () => {
+    const content = 'x'.repeat(1000);
+    const uploaded = new Date('2024-01-01T00:00:00Z');
+    let stored: Map<string, Response>;
+    let pending: Promise<unknown>[];
+    let gets: Array<{ key: string; options?: unknown }>;
+    let fullReadGate: Promise<void> | null;
+
+    const bucket = {
+      head: async () => ({ size: content.length, httpEtag: '"abc"', uploaded, httpMetadata: {} }),
+      get: async (key: string, options?: { range?: { offset: number; length: number } }) => {
+        gets.push({ key, options });
+        if (!options && fullReadGate) {
+          await fullReadGate;
+        }
+        const body = options?.range
+          ? content.slice(options.range.offset, options.range.offset + options.range.length)
+          : content;
+        return { body, size: content.length, httpEtag: '"abc"', uploaded, httpMetadata: { contentType: 'video/mp4' } };
+      },
+    };
+
+    const request = (headers: Record<string, string> = {}, url = 'http://localhost/media/video.mp4') =>
+      mediaRoutes.request(
+        url,
+        { headers },
+        { R2_BUCKET: bucket },
+        { waitUntil: (promise: Promise<unknown>) => pending.push(promise), passThroughOnException: () => {} } as any
+      );
+
+    beforeEach(() => {
+      stored = new Map();
+      pending = [];
+      gets = [];
+      fullReadGate = null;
+      (globalThis as any).caches = {
+        default: {
+          match: async () => undefined,
+          put: async (key: Request, response: Response) => {
+            stored.set(key.url, response);
+          },
+          delete: async () => true,
+        },
+      };
+    });
+
+    afterEach(() => {
+      delete (globalThis as any).caches;
+    });
+
+    it('should fill the cache with the full object on a range miss', async () => {
+      const res = await request({ Range: 'bytes=0-' });
+      await Promise.all(pending);
+
+      expect(res.status).toBe(206);
+      expect(res.headers.get('Content-Range')).toBe('bytes 0-999/1000');
+      // One ranged read for the response, one full read to fill the cache
+      expect(gets).toHaveLength(2);
+      expect(gets[1].options).toBeUndefined();
+
+      const cached = stored.get('http://localhost/media/video.mp4');
+      expect(cached?.status).toBe(200);
+      expect(cached?.headers.get('Content-Length')).toBe('1000');
+      expect(cached?.headers.get('Content-Range')).toBeNull();
+      expect(await cached?.text()).toBe(content);
+    });
+
+    it('should cache full responses', async () => {
+      const res = await request();
+      await Promise.all(pending);
+
+      expect(res.status).toBe(200);
+      expect(gets).toHaveLength(1);
+      expect(stored.has('http://localhost/media/video.mp4')).toBe(true);
+    });
+
+    it('should not fill the cache on seek ranges', async () => {
+      const res = await request({ Range: 'bytes=500-' });
+      await Promise.all(pending);
+
+      expect(res.status).toBe(206);
+      expect(gets).toHaveLength(1);
+      expect(stored.size).toBe(0);
+    });
+
+    it('should start one fill per key for concurrent range misses', async () => {
+      // Hold the first fill open while the second request arrives
+      let releaseFill = () => {};
+      fullReadGate = new Promise((resolve) => {
+        releaseFill = resolve;
+      });
+      await request({ Range: 'bytes=0-' });
+      await request({ Range: 'bytes=0-' });
+      releaseFill();
+      await Promise.all(pending);
+
+      // Two ranged reads for the responses, one full read to fill the cache
+      expect(gets.filter((get) => get.options === undefined)).toHaveLength(1);
+      expect(gets).toHaveLength(3);
+    });
+
+    it('should skip the cache on workers.dev, where the Cache API is a no-op', async () => {
+      const url = 'https://omni-cms-api.example.workers.dev/media/video.mp4';
+      let matched = false;
+      (globalThis as any).caches.default.match = async () => {
+        matched = true;
+        return undefined;
+      };
+
+      const res = await request({ Range: 'bytes=0-' }, url);
+      await Promise.all(pending);
+
+      expect(res.status).toBe(206);
+      expect(matched).toBe(false);
+      expect(gets).toHaveLength(1);
+      expect(stored.size).toBe(0);
+    });
+  });
+});
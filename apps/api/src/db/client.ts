@@ -1,5 +1,5 @@
 import { drizzle } from 'drizzle-orm/d1';
-import type { D1Database } from '@cloudflare/workers-types';
+import type { D1Database, D1PreparedStatement } from '@cloudflare/workers-types';
 import * as schema from './schema';
 
 // This will be used in API routes with Cloudflare D1 binding
@@ -8,3 +8,87 @@ export function getDb(d1: D1Database) {
 }
 
 export type DbClient = ReturnType<typeof getDb>;
+
+export interface QueryTiming {
+  sql: string;
+  durationMs: number;
+}
+
+/**
+ * Per-request D1 statement metrics, filled in by an instrumented D1 binding
+ */
+export interface DbMetrics {
+  queryCount: number;
+  durationMs: number;
+  queries: QueryTiming[];
+}
+
+export function createDbMetrics(): DbMetrics {
+  return { queryCount: 0, durationMs: 0, queries: [] };
+}
+
+// Methods on a prepared statement that actually execute SQL
+const EXECUTING_METHODS = new Set(['all', 'first', 'run', 'raw']);
+
+/**
+ * Wrap a D1 binding so every executed statement is counted and timed into `metrics`.
+ * Drizzle (and any raw `prepare()` callers) use the wrapper exactly like the real binding.
+ */
+export function instrumentD1(d1: D1Database, metrics: DbMetrics): D1Database {
+  // D1's batch() only accepts genuine prepared statements, so keep a way back
+  const originals = new WeakMap<object, D1PreparedStatement>();
+
+  const record = (sql: string, startedAt: number, statements = 1) => {
+    const durationMs = performance.now() - startedAt;
+    metrics.queryCount += statements;
+    metrics.durationMs += durationMs;
+    metrics.queries.push({ sql, durationMs });
+  };
+
+  const wrapStatement = (statement: D1PreparedStatement, sql: string): D1PreparedStatement => {
+    const proxy = new Proxy(statement, {
+      get(target, prop, receiver) {
+        const value = Reflect.get(target, prop, receiver);
+        if (typeof value !== 'function') {
+          return value;
+        }
+        if (prop === 'bind') {
+          return (...params: unknown[]) => wrapStatement(target.bind(...params), sql);
+        }
+        if (typeof prop === 'string' && EXECUTING_METHODS.has(prop)) {
+          return async (...args: unknown[]) => {
+            const startedAt = performance.now();
+            try {
+              return await (value as (...a: unknown[]) => Promise<unknown>).apply(target, args);
+            } finally {
+              record(sql, startedAt);
+            }
+          };
+        }
+        return value.bind(target);
+      },
+    });
+    originals.set(proxy, statement);
+    return proxy;
+  };
+
+  return new Proxy(d1, {
+    get(target, prop, receiver) {
+      const value = Reflect.get(target, prop, receiver);
+      if (prop === 'prepare') {
+        return (sql: string) => wrapStatement(target.prepare(sql), sql);
+      }
+      if (prop === 'batch') {
+        return async (statements: D1PreparedStatement[]) => {
+          const startedAt = performance.now();
+          try {
+            return await target.batch(statements.map((statement) => originals.get(statement) ?? statement));
+          } finally {
+            record(`batch(${statements.length})`, startedAt, statements.length);
+          }
+        };
+      }
+      return typeof value === 'function' ? value.bind(target) : value;
+    },
+  });
+}
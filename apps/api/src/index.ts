@@ -1,11 +1,13 @@
 import { Hono } from 'hono';
 import { cors } from 'hono/cors';
 import type { CloudflareBindings, HonoVariables } from './types';
+import { serverTimingMiddleware, QUERY_COUNT_HEADER } from './lib/api/server-timing';
 
 // Import route modules
 import adminOrganizations from './routes/admin/organizations';
 import adminPosts from './routes/admin/posts';
 import adminPostDetail from './routes/admin/post-detail';
+import adminPostsBatch from './routes/admin/posts-batch';
 import adminMedia from './routes/admin/media';
 import adminMediaDetail from './routes/admin/media-detail';
 import adminPostTypes from './routes/admin/post-types';
@@ -108,10 +110,14 @@ app.use('*', async (c, next) => {
     origin: corsOrigin,
     allowMethods: ['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'],
     allowHeaders: ['Content-Type', 'Authorization', 'X-API-Key'],
+    exposeHeaders: ['Server-Timing', QUERY_COUNT_HEADER],
     credentials: true,
   })(c, next);
 });
 
+// Per-request D1 query count and Server-Timing header
+app.use('*', serverTimingMiddleware);
+
 // Health check
 app.get('/health', (c) => {
   return c.json({ status: 'ok', service: 'omni-cms-api' });
@@ -121,6 +127,7 @@ app.get('/health', (c) => {
 app.route('/api/admin/v1/organizations', adminOrganizations);
 app.route('/api/admin/v1/organizations', adminPosts);
 app.route('/api/admin/v1/organizations', adminPostDetail);
+app.route('/api/admin/v1/organizations', adminPostsBatch);
 app.route('/api/admin/v1/organizations', adminMedia);
 app.route('/api/admin/v1/organizations', adminMediaDetail);
 app.route('/api/admin/v1/organizations', adminPostTypes);
@@ -211,4 +218,7 @@ app.onError((err, c) => {
   }, 500);
 });
 
+// Durable Object classes must be exported from the Worker entrypoint
+export { PostCollaboration } from './lib/collaboration/post-collaboration-object';
+
 export default app;
@@ -0,0 +1,136 @@
+// Per-request Server-Timing instrumentation
+//
+// Every request gets its own D1 wrapper (see instrumentD1) so all getDb() call
+// sites are counted without touching the routes. The response then carries:
+//
+//   Server-Timing: db;dur=12.4;desc="7 queries", hydrate;dur=3.1, serialize;dur=0.8, total;dur=16.3
+//   X-DB-Query-Count: 7
+//
+// Note: inside deployed Workers the clock only advances across I/O, so CPU-only
+// phases (hydrate, serialize) usually report 0 there. Under wrangler dev /
+// miniflare the timings are real, which is where the sweep scripts run.
+
+import type { MiddlewareHandler } from 'hono';
+import type { CloudflareBindings, HonoVariables } from '../../types';
+import { createDbMetrics, instrumentD1, type DbMetrics } from '../../db/client';
+
+export const QUERY_COUNT_HEADER = 'X-DB-Query-Count';
+
+const DEFAULT_SLOW_REQUEST_MS = 1000;
+const DEFAULT_SLOW_REQUEST_SAMPLE_RATE = 1;
+const SLOW_REQUEST_TOP_QUERIES = 10;
+
+export interface RequestMetrics {
+  db: DbMetrics;
+  serializeMs: number;
+}
+
+export interface ServerTimingPhases {
+  queryCount: number;
+  dbMs: number;
+  hydrateMs: number;
+  serializeMs: number;
+  totalMs: number;
+}
+
+const round = (ms: number) => Math.round(ms * 10) / 10;
+
+/**
+ * Split a request's wall time into db / hydrate / serialize phases.
+ * "hydrate" is everything that is neither a D1 call nor JSON serialization
+ * (auth checks, mapping rows into response objects, etc.)
+ */
+export function computePhases(metrics: RequestMetrics, totalMs: number): ServerTimingPhases {
+  return {
+    queryCount: metrics.db.queryCount,
+    dbMs: metrics.db.durationMs,
+    hydrateMs: Math.max(0, totalMs - metrics.db.durationMs - metrics.serializeMs),
+    serializeMs: metrics.serializeMs,
+    totalMs,
+  };
+}
+
+export function formatServerTiming(phases: ServerTimingPhases): string {
+  const queryLabel = phases.queryCount === 1 ? 'query' : 'queries';
+  return [
+    `db;dur=${round(phases.dbMs)};desc="${phases.queryCount} ${queryLabel}"`,
+    `hydrate;dur=${round(phases.hydrateMs)}`,
+    `serialize;dur=${round(phases.serializeMs)}`,
+    `total;dur=${round(phases.totalMs)}`,
+  ].join(', ');
+}
+
+function parseNumber(value: string | undefined, fallback: number): number {
+  if (value === undefined || value === '') {
+    return fallback;
+  }
+  const parsed = Number(value);
+  return Number.isFinite(parsed) ? parsed : fallback;
+}
+
+/**
+ * Middleware that counts and times D1 statements per request and reports them
+ * via Server-Timing. Requests slower than SLOW_REQUEST_MS are sampled
+ * (SLOW_REQUEST_SAMPLE_RATE) into the Workers log as a structured trace.
+ */
+export const serverTimingMiddleware: MiddlewareHandler<{
+  Bindings: CloudflareBindings;
+  Variables: HonoVariables;
+}> = async (c, next) => {
+  const startedAt = performance.now();
+  const metrics: RequestMetrics = { db: createDbMetrics(), serializeMs: 0 };
+  c.set('metrics', metrics);
+
+  // Routes and middleware call getDb(c.env.DB), so swapping the binding here
+  // covers every call site for this request only
+  if (c.env?.DB) {
+    c.env = { ...c.env, DB: instrumentD1(c.env.DB, metrics.db) };
+  }
+
+  const json = c.json;
+  c.json = ((...args: Parameters<typeof json>) => {
+    const serializeStartedAt = performance.now();
+    try {
+      return json(...args);
+    } finally {
+      metrics.serializeMs += performance.now() - serializeStartedAt;
+    }
+  }) as typeof json;
+
+  await next();
+
+  const phases = computePhases(metrics, performance.now() - startedAt);
+  // WebSocket upgrades can't be re-wrapped and carry no useful timing
+  if (c.res.status !== 101) {
+    try {
+      c.res.headers.append('Server-Timing', formatServerTiming(phases));
+      c.res.headers.set(QUERY_COUNT_HEADER, String(phases.queryCount));
+    } catch {
+      // Responses from fetch()/Cache API have immutable headers
+      c.res = new Response(c.res.body, c.res);
+      c.res.headers.append('Server-Timing', formatServerTiming(phases));
+      c.res.headers.set(QUERY_COUNT_HEADER, String(phases.queryCount));
+    }
+  }
+
+  const slowRequestMs = parseNumber(c.env?.SLOW_REQUEST_MS, DEFAULT_SLOW_REQUEST_MS);
+  const sampleRate = parseNumber(c.env?.SLOW_REQUEST_SAMPLE_RATE, DEFAULT_SLOW_REQUEST_SAMPLE_RATE);
+  if (phases.totalMs >= slowRequestMs && Math.random() < sampleRate) {
+    const topQueries = [...metrics.db.queries]
+      .sort((a, b) => b.durationMs - a.durationMs)
+      .slice(0, SLOW_REQUEST_TOP_QUERIES)
+      .map((query) => ({ sql: query.sql, durationMs: round(query.durationMs) }));
+
+    console.warn('[SLOW_REQUEST]', JSON.stringify({
+      method: c.req.method,
+      path: c.req.path,
+      status: c.res.status,
+      queryCount: phases.queryCount,
+      dbMs: round(phases.dbMs),
+      hydrateMs: round(phases.hydrateMs),
+      serializeMs: round(phases.serializeMs),
+      totalMs: round(phases.totalMs),
+      topQueries,
+    }));
+  }
+};
@@ -0,0 +1,469 @@
+import type { DbClient } from '@/db/client';
+import { nanoid } from 'nanoid';
+import { eq, and, or, inArray, sql } from 'drizzle-orm';
+import {
+  posts,
+  postTypes,
+  customFields,
+  postFieldValues,
+  postTaxonomies,
+  taxonomies as taxonomiesTable,
+  taxonomyTerms,
+  media,
+  type Post,
+  type PostFieldValue,
+  type PostTaxonomy,
+} from '@/db/schema';
+import type { BatchGetPostsInput, UpsertPostItemInput } from '@/lib/validations/post';
+
+// D1 allows at most 100 bound parameters per statement
+const D1_MAX_BOUND_PARAMETERS = 100;
+// Keys per `inArray` lookup, leaving room for the organization filter
+const MAX_KEYS_PER_QUERY = 90;
+
+type BatchStatement = Parameters<DbClient['batch']>[0][number];
+
+function chunk<T>(items: T[], size: number): T[][] {
+  const chunks: T[][] = [];
+  for (let i = 0; i < items.length; i += size) {
+    chunks.push(items.slice(i, i + size));
+  }
+  return chunks;
+}
+
+/**
+ * Rows per multi-row INSERT so the statement stays under D1's parameter limit
+ */
+function rowsPerInsert(columnsPerRow: number): number {
+  return Math.max(1, Math.floor(D1_MAX_BOUND_PARAMETERS / columnsPerRow));
+}
+
+/**
+ * Run statements in a single D1 batch (one round-trip, one implicit transaction)
+ */
+async function runBatch(db: DbClient, statements: BatchStatement[]) {
+  if (statements.length === 0) {
+    return [];
+  }
+  return db.batch(statements as [BatchStatement, ...BatchStatement[]]);
+}
+
+export interface BatchPostDetail extends Post {
+  fieldValues: PostFieldValue[];
+  taxonomies: PostTaxonomy[];
+}
+
+export interface BatchGetResult {
+  key: string;
+  keyType: 'id' | 'slug';
+  found: boolean;
+  post?: BatchPostDetail;
+  error?: string;
+}
+
+/**
+ * Load many posts with their custom field values and taxonomy links.
+ * All lookups for the batch go to D1 in a single `db.batch` round-trip.
+ */
+export async function batchGetPosts(
+  db: DbClient,
+  organizationId: string,
+  input: BatchGetPostsInput
+): Promise<BatchGetResult[]> {
+  const ids = Array.from(new Set(input.ids ?? []));
+  const slugs = Array.from(new Set(input.slugs ?? []));
+
+  const postLookups: BatchStatement[] = [
+    ...chunk(ids, MAX_KEYS_PER_QUERY).map((idChunk) =>
+      db.select().from(posts).where(and(
+        eq(posts.organizationId, organizationId),
+        inArray(posts.id, idChunk)
+      ))
+    ),
+    ...chunk(slugs, MAX_KEYS_PER_QUERY - 1).map((slugChunk) =>
+      db.select().from(posts).where(and(
+        eq(posts.organizationId, organizationId),
+        inArray(posts.slug, slugChunk),
+        ...(input.postTypeId ? [eq(posts.postTypeId, input.postTypeId)] : [])
+      ))
+    ),
+  ];
+
+  const postRows = (await runBatch(db, postLookups)).flat() as Post[];
+  const postsById = new Map(postRows.map((post) => [post.id, post]));
+  const postIds = Array.from(postsById.keys());
+
+  // Related rows for every matched post, again in one round-trip
+  const relatedLookups: BatchStatement[] = [];
+  const postIdChunks = chunk(postIds, MAX_KEYS_PER_QUERY);
+  for (const idChunk of postIdChunks) {
+    relatedLookups.push(db.select().from(postFieldValues).where(inArray(postFieldValues.postId, idChunk)));
+  }
+  for (const idChunk of postIdChunks) {
+    relatedLookups.push(db.select().from(postTaxonomies).where(inArray(postTaxonomies.postId, idChunk)));
+  }
+  const relatedResults = await runBatch(db, relatedLookups);
+  const fieldValueRows = relatedResults.slice(0, postIdChunks.length).flat() as PostFieldValue[];
+  const taxonomyRows = relatedResults.slice(postIdChunks.length).flat() as PostTaxonomy[];
+
+  const fieldValuesByPost = new Map<string, PostFieldValue[]>();
+  for (const row of fieldValueRows) {
+    fieldValuesByPost.set(row.postId, [...(fieldValuesByPost.get(row.postId) ?? []), row]);
+  }
+  const taxonomiesByPost = new Map<string, PostTaxonomy[]>();
+  for (const row of taxonomyRows) {
+    taxonomiesByPost.set(row.postId, [...(taxonomiesByPost.get(row.postId) ?? []), row]);
+  }
+
+  const toDetail = (post: Post): BatchPostDetail => ({
+    ...post,
+    fieldValues: fieldValuesByPost.get(post.id) ?? [],
+    taxonomies: taxonomiesByPost.get(post.id) ?? [],
+  });
+
+  const results: BatchGetResult[] = [];
+  for (const id of ids) {
+    const post = postsById.get(id);
+    results.push(post ? { key: id, keyType: 'id', found: true, post: toDetail(post) } : { key: id, keyType: 'id', found: false });
+  }
+  for (const slug of slugs) {
+    const matches = postRows.filter((post) => post.slug === slug);
+    if (matches.length > 1) {
+      results.push({
+        key: slug,
+        keyType: 'slug',
+        found: false,
+        error: 'Multiple posts share this slug; specify postTypeId',
+      });
+    } else if (matches.length === 1) {
+      results.push({ key: slug, keyType: 'slug', found: true, post: toDetail(matches[0]) });
+    } else {
+      results.push({ key: slug, keyType: 'slug', found: false });
+    }
+  }
+
+  return results;
+}
+
+export interface BatchUpsertItemResult {
+  index: number;
+  status: 'created' | 'updated' | 'error';
+  id?: string;
+  slug?: string;
+  error?: string;
+}
+
+export interface BatchUpsertResult {
+  results: BatchUpsertItemResult[];
+  created: Post[];
+  updated: Post[];
+}
+
+/**
+ * Create or update many posts with custom fields and taxonomies.
+ *
+ * Referenced post types, custom fields, taxonomy terms, media, parent posts and
+ * existing posts are resolved with one lookup each for the whole batch (all
+ * scoped to the organization); items that fail those checks are reported
+ * individually and skipped, so an unknown id never fails the write batch. All writes then run in a single `db.batch`, so the
+ * valid items are applied atomically.
+ *
+ * Custom field values are merged (upserted per field); taxonomies, when given,
+ * replace the post's existing term links.
+ */
+export async function batchUpsertPosts(
+  db: DbClient,
+  organizationId: string,
+  authorId: string,
+  items: UpsertPostItemInput[]
+): Promise<BatchUpsertResult> {
+  const results: BatchUpsertItemResult[] = items.map((item, index) => ({
+    index,
+    status: 'error',
+    id: item.id,
+    slug: item.slug,
+  }));
+
+  // Collect every reference in the batch so each is resolved with one lookup
+  const itemIds = Array.from(new Set(items.map((item) => item.id).filter((id): id is string => !!id)));
+  const itemSlugs = Array.from(new Set(items.map((item) => item.slug).filter((slug): slug is string => !!slug)));
+  const postTypeIds = Array.from(new Set(items.map((item) => item.postTypeId).filter((id): id is string => !!id)));
+  const fieldKeys = Array.from(new Set(items.flatMap((item) => Object.keys(item.customFields ?? {}))));
+  const termIds = Array.from(new Set(items.flatMap((item) => Object.values(item.taxonomies ?? {}).flat().map(String))));
+  const mediaIds = Array.from(new Set(items.flatMap((item) => [item.featuredImageId, item.ogImageId])
+    .filter((id): id is string => !!id)));
+  const parentIds = Array.from(new Set(items.map((item) => item.parentId).filter((id): id is string => !!id)));
+
+  const lookups: BatchStatement[] = [];
+  const idChunks = chunk(itemIds, MAX_KEYS_PER_QUERY);
+  const slugChunks = chunk(itemSlugs, MAX_KEYS_PER_QUERY);
+  const postTypeChunks = chunk(postTypeIds, MAX_KEYS_PER_QUERY);
+  // Custom fields may be referenced by id or slug; each key is bound twice
+  const fieldKeyChunks = chunk(fieldKeys, Math.floor(MAX_KEYS_PER_QUERY / 2));
+  const termChunks = chunk(termIds, MAX_KEYS_PER_QUERY);
+  const mediaChunks = chunk(mediaIds, MAX_KEYS_PER_QUERY);
+  const parentChunks = chunk(parentIds, MAX_KEYS_PER_QUERY);
+
+  for (const idChunk of idChunks) {
+    lookups.push(db.select().from(posts).where(and(
+      eq(posts.organizationId, organizationId),
+      inArray(posts.id, idChunk)
+    )));
+  }
+  for (const slugChunk of slugChunks) {
+    lookups.push(db.select().from(posts).where(and(
+      eq(posts.organizationId, organizationId),
+      inArray(posts.slug, slugChunk)
+    )));
+  }
+  for (const typeChunk of postTypeChunks) {
+    lookups.push(db.select({ id: postTypes.id }).from(postTypes).where(and(
+      eq(postTypes.organizationId, organizationId),
+      inArray(postTypes.id, typeChunk)
+    )));
+  }
+  for (const keyChunk of fieldKeyChunks) {
+    lookups.push(db.select({ id: customFields.id, slug: customFields.slug }).from(customFields).where(and(
+      eq(customFields.organizationId, organizationId),
+      or(inArray(customFields.id, keyChunk), inArray(customFields.slug, keyChunk))
+    )));
+  }
+  for (const termChunk of termChunks) {
+    lookups.push(db.select({ id: taxonomyTerms.id }).from(taxonomyTerms).where(and(
+      inArray(taxonomyTerms.id, termChunk),
+      inArray(
+        taxonomyTerms.taxonomyId,
+        db.select({ id: taxonomiesTable.id }).from(taxonomiesTable).where(eq(taxonomiesTable.organizationId, organizationId))
+      )
+    )));
+  }
+  for (const mediaChunk of mediaChunks) {
+    lookups.push(db.select({ id: media.id }).from(media).where(and(
+      eq(media.organizationId, organizationId),
+      inArray(media.id, mediaChunk)
+    )));
+  }
+  for (const parentChunk of parentChunks) {
+    lookups.push(db.select({ id: posts.id }).from(posts).where(and(
+      eq(posts.organizationId, organizationId),
+      inArray(posts.id, parentChunk)
+    )));
+  }
+
+  const lookupResults = await runBatch(db, lookups);
+  let offset = 0;
+  const take = (count: number) => {
+    const rows = lookupResults.slice(offset, offset + count).flat();
+    offset += count;
+    return rows;
+  };
+  const existingPosts = [...take(idChunks.length), ...take(slugChunks.length)] as Post[];
+  const knownPostTypeIds = new Set((take(postTypeChunks.length) as Array<{ id: string }>).map((row) => row.id));
+  const fieldRows = take(fieldKeyChunks.length) as Array<{ id: string; slug: string }>;
+  const knownTermIds = new Set((take(termChunks.length) as Array<{ id: string }>).map((row) => row.id));
+  const knownMediaIds = new Set((take(mediaChunks.length) as Array<{ id: string }>).map((row) => row.id));
+  const knownParentIds = new Set((take(parentChunks.length) as Array<{ id: string }>).map((row) => row.id));
+
+  const postsById = new Map(existingPosts.map((post) => [post.id, post]));
+  const postsByTypeSlug = new Map(existingPosts.map((post) => [`${post.postTypeId}:${post.slug}`, post]));
+  const fieldIdByKey = new Map<string, string>();
+  for (const field of fieldRows) {
+    fieldIdByKey.set(field.id, field.id);
+    // Slugs aren't unique across post types; ids always win over slugs
+    if (!fieldIdByKey.has(field.slug)) {
+      fieldIdByKey.set(field.slug, field.id);
+    }
+  }
+
+  const now = new Date();
+  const statements: BatchStatement[] = [];
+  const newPosts: Array<typeof posts.$inferInsert> = [];
+  const fieldValueRows: Array<typeof postFieldValues.$inferInsert> = [];
+  const taxonomyReplacements = new Map<string, string[]>();
+  const createdIds: string[] = [];
+  const updatedIds: string[] = [];
+  // Guards against two items in one batch targeting the same post or slug
+  const claimed = new Set<string>();
+
+  items.forEach((item, index) => {
+    const result = results[index];
+
+    const existing = item.id
+      ? postsById.get(item.id)
+      : postsByTypeSlug.get(`${item.postTypeId}:${item.slug}`);
+
+    if (item.id && !existing) {
+      result.error = 'Post not found';
+      return;
+    }
+
+    // postTypeId only matches or places new posts; moving a post between types
+    // would skip the slug and ownership checks below
+    if (existing && item.postTypeId && item.postTypeId !== existing.postTypeId) {
+      result.error = 'Post type cannot be changed in a batch upsert';
+      return;
+    }
+
+    const postTypeId = existing?.postTypeId ?? item.postTypeId!;
+    if (!existing && !knownPostTypeIds.has(postTypeId)) {
+      result.error = 'Post type not found';
+      return;
+    }
+    if (!existing && !item.title) {
+      result.error = 'Title is required to create a post';
+      return;
+    }
+
+    const unknownFields = Object.keys(item.customFields ?? {}).filter((key) => !fieldIdByKey.has(key));
+    if (unknownFields.length > 0) {
+      result.error = `Unknown custom fields: ${unknownFields.join(', ')}`;
+      return;
+    }
+
+    const unknownTerms = Object.values(item.taxonomies ?? {}).flat().map(String).filter((id) => !knownTermIds.has(id));
+    if (unknownTerms.length > 0) {
+      result.error = `Unknown taxonomy terms: ${Array.from(new Set(unknownTerms)).join(', ')}`;
+      return;
+    }
+    const unknownMedia = [item.featuredImageId, item.ogImageId].filter((id): id is string => !!id && !knownMediaIds.has(id));
+    if (unknownMedia.length > 0) {
+      result.error = `Media not found: ${Array.from(new Set(unknownMedia)).join(', ')}`;
+      return;
+    }
+    if (item.parentId && !knownParentIds.has(item.parentId)) {
+      result.error = 'Parent post not found';
+      return;
+    }
+
+    const postId = existing?.id ?? nanoid();
+    const slug = item.slug ?? existing!.slug;
+    const slugOwner = postsByTypeSlug.get(`${postTypeId}:${slug}`);
+    if (slugOwner && slugOwner.id !== postId) {
+      result.error = 'Post with this slug already exists for this post type';
+      return;
+    }
+    const claimKeys = [postId, `${postTypeId}:${slug}`];
+    if (claimKeys.some((key) => claimed.has(key))) {
+      result.error = 'Duplicate item in batch';
+      return;
+    }
+    claimKeys.forEach((key) => claimed.add(key));
+
+    const {
+      id: _id,
+      postTypeId: _postTypeId,
+      customFields: itemFields,
+      taxonomies,
+      scheduledPublishAt,
+      structuredData,
+      ...postFields
+    } = item;
+    const postData: Record<string, unknown> = { ...postFields };
+    if (scheduledPublishAt !== undefined) {
+      postData.scheduledPublishAt = scheduledPublishAt ? new Date(scheduledPublishAt) : null;
+    }
+    if (structuredData !== undefined) {
+      postData.structuredData = structuredData ? JSON.stringify(structuredData) : null;
+    }
+
+    if (existing) {
+      if (item.status === 'published' && !existing.publishedAt) {
+        postData.publishedAt = now;
+      }
+      statements.push(
+        db.update(posts)
+          .set({ ...postData, updatedAt: now } as any)
+          .where(and(eq(posts.id, postId), eq(posts.organizationId, organizationId)))
+      );
+      updatedIds.push(postId);
+      result.status = 'updated';
+    } else {
+      newPosts.push({
+        ...(postData as Partial<typeof posts.$inferInsert>),
+        id: postId,
+        organizationId,
+        authorId,
+        postTypeId,
+        title: item.title!,
+        slug,
+        status: item.status || 'draft',
+        publishedAt: item.status === 'published' ? now : null,
+        createdAt: now,
+        updatedAt: now,
+      });
+      createdIds.push(postId);
+      result.status = 'created';
+    }
+    result.id = postId;
+    result.slug = slug;
+
+    for (const [key, value] of Object.entries(itemFields ?? {})) {
+      fieldValueRows.push({
+        id: nanoid(),
+        postId,
+        customFieldId: fieldIdByKey.get(key)!,
+        value: JSON.stringify(value),
+        createdAt: now,
+        updatedAt: now,
+      });
+    }
+
+    if (taxonomies !== undefined) {
+      taxonomyReplacements.set(postId, Object.values(taxonomies).flat().map(String));
+    }
+  });
+
+  // New posts first so field values and term links can reference them.
+  // Insert column sets must match per statement, so posts are inserted row by row.
+  for (const row of newPosts) {
+    statements.push(db.insert(posts).values(row));
+  }
+
+  for (const rows of chunk(fieldValueRows, rowsPerInsert(6))) {
+    statements.push(
+      db.insert(postFieldValues)
+        .values(rows)
+        .onConflictDoUpdate({
+          target: [postFieldValues.postId, postFieldValues.customFieldId],
+          set: {
+            value: sql`excluded.value`,
+            updatedAt: sql`excluded.updated_at`,
+          },
+        })
+    );
+  }
+
+  const replacedPostIds = Array.from(taxonomyReplacements.keys());
+  for (const idChunk of chunk(replacedPostIds, MAX_KEYS_PER_QUERY)) {
+    statements.push(db.delete(postTaxonomies).where(inArray(postTaxonomies.postId, idChunk)));
+  }
+  const taxonomyRows = replacedPostIds.flatMap((postId) =>
+    Array.from(new Set(taxonomyReplacements.get(postId))).map((taxonomyTermId) => ({
+      id: nanoid(),
+      postId,
+      taxonomyTermId,
+      createdAt: now,
+    }))
+  );
+  for (const rows of chunk(taxonomyRows, rowsPerInsert(4))) {
+    statements.push(db.insert(postTaxonomies).values(rows));
+  }
+
+  await runBatch(db, statements);
+
+  // Read back the final rows so callers (and webhooks) see persisted values
+  const writtenIds = [...createdIds, ...updatedIds];
+  const written = (await runBatch(
+    db,
+    chunk(writtenIds, MAX_KEYS_PER_QUERY).map((idChunk) =>
+      db.select().from(posts).where(inArray(posts.id, idChunk))
+    )
+  )).flat() as Post[];
+  const writtenById = new Map(written.map((post) => [post.id, post]));
+
+  return {
+    results,
+    created: createdIds.map((id) => writtenById.get(id)).filter((post): post is Post => !!post),
+    updated: updatedIds.map((id) => writtenById.get(id)).filter((post): post is Post => !!post),
+  };
+}
@@ -107,6 +107,59 @@ export async function invalidatePostCache(
   }
 }
 
+/**
+ * Deletes the given public API paths from the default Cache API
+ * Returns the number of entries that were actually removed
+ */
+async function deleteCachedPaths(paths: string[], appUrl: string): Promise<number> {
+  const cache = (caches as unknown as { default: Cache }).default;
+  const deleted = await Promise.all(paths.map(async (path) => {
+    try {
+      return await cache.delete(new Request(`${appUrl}${path}`, { method: 'GET' }));
+    } catch (error) {
+      console.error(`Failed to invalidate cache for ${path}:`, error);
+      return false;
+    }
+  }));
+  return deleted.filter(Boolean).length;
+}
+
+/**
+ * Invalidates cache for many posts at once (batch writes)
+ * Resolves the organization slug once and deletes the list path plus each
+ * post's detail paths (by id and by slug) in a single pass.
+ *
+ * Like invalidateMediaCache, this only reaches the Cache API of the current
+ * data center, and list URLs with query strings (filters, pagination) can't be
+ * enumerated - those expire through their s-maxage.
+ * @param organizationIdOrSlug - The organization ID or slug
+ * @param postIdsOrSlugs - The post IDs and/or slugs
+ * @param db - Optional database client to look up organization slug from ID
+ * @param appUrl - The Workers base URL the public API is served from
+ * @returns Number of cache entries removed
+ */
+export async function invalidatePostsCache(
+  organizationIdOrSlug: string,
+  postIdsOrSlugs: string[],
+  db?: DbClient | null,
+  appUrl?: string
+): Promise<number> {
+  if (!appUrl || typeof caches === 'undefined') {
+    return 0;
+  }
+
+  const orgSlug = db
+    ? await normalizeOrganizationIdentifier(db, organizationIdOrSlug)
+    : organizationIdOrSlug;
+
+  const cachePaths = Array.from(new Set([
+    `/api/public/v1/${orgSlug}/posts`,
+    ...postIdsOrSlugs.map((postIdOrSlug) => `/api/public/v1/${orgSlug}/posts/${postIdOrSlug}`),
+  ]));
+
+  return deleteCachedPaths(cachePaths, appUrl);
+}
+
 /**
  * Invalidates cache for taxonomy-related endpoints
  * @param organizationIdOrSlug - The organization ID or slug
@@ -183,3 +236,39 @@ export async function revalidatePublicPath(path: string): Promise<void> {
   }
 }
 
+
+/**
+ * Removes a media file (and its variant URLs) from the Cache API of the current
+ * data center.
+ *
+ * Limitation: Cache API deletes are local to the colo running this Worker. Other
+ * data centers keep serving their copy (cached `public, max-age=31536000, immutable`)
+ * until it is evicted. A global purge needs the zone purge_cache API, see
+ * revalidatePublicPath() - which is not wired up yet.
+ * @param fileKey - The R2 file key
+ * @param appUrl - The Workers base URL the media route is served from
+ */
+export async function invalidateMediaCache(
+  fileKey: string,
+  appUrl?: string
+): Promise<void> {
+  if (!appUrl || typeof caches === 'undefined') {
+    return;
+  }
+
+  const baseUrl = `${appUrl}/api/public/v1/media/${fileKey}`;
+  const cacheUrls = [
+    baseUrl,
+    `${baseUrl}?variant=thumbnail`,
+    `${baseUrl}?variant=large`,
+  ];
+
+  const cache = (caches as unknown as { default: Cache }).default;
+  for (const url of cacheUrls) {
+    try {
+      await cache.delete(new Request(url, { method: 'GET' }));
+    } catch (error) {
+      console.error(`Failed to invalidate media cache for ${url}:`, error);
+    }
+  }
+}
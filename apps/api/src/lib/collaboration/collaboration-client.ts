@@ -0,0 +1,59 @@
+/**
+ * Worker-side helpers for routing presence and lock requests to the per-post
+ * PostCollaboration Durable Object.
+ *
+ * When the `POST_COLLABORATION` binding is not configured (local dev without
+ * Durable Objects, older deployments) these helpers return null and the routes
+ * fall back to the D1-backed implementation.
+ */
+
+import type { Context } from 'hono';
+import type { CloudflareBindings, HonoVariables } from '../../types';
+import { encodeCollaborationUser, type CollaborationUser } from './post-collaboration-object';
+
+type HonoContext = Context<{ Bindings: CloudflareBindings; Variables: HonoVariables }>;
+
+/**
+ * Forward the current request to the post's Durable Object.
+ * Returns null when Durable Objects are not available.
+ *
+ * @param path - Action path inside the Durable Object (e.g. `/lock`, `/presence`)
+ */
+export async function forwardToPostCollaboration(
+  c: HonoContext,
+  postId: string,
+  path: string
+): Promise<Response | null> {
+  const namespace = c.env.POST_COLLABORATION;
+  const user = c.get('user');
+  const organizationId = c.get('organizationId');
+  if (!namespace || !user || !organizationId) {
+    return null;
+  }
+
+  const collaborationUser: CollaborationUser = {
+    id: user.id,
+    name: user.name,
+    email: user.email,
+    avatarUrl: user.avatarUrl,
+  };
+
+  const headers = new Headers({
+    'X-Post-Id': postId,
+    'X-Organization-Id': organizationId,
+    'X-Collaboration-User': encodeCollaborationUser(collaborationUser),
+  });
+  // Preserve WebSocket upgrade headers for the connect endpoint
+  for (const name of ['Upgrade', 'Connection', 'Sec-WebSocket-Key', 'Sec-WebSocket-Version', 'Sec-WebSocket-Protocol']) {
+    const value = c.req.header(name);
+    if (value) {
+      headers.set(name, value);
+    }
+  }
+
+  const stub = namespace.get(namespace.idFromName(postId));
+  return stub.fetch(`https://post-collaboration${path}`, {
+    method: c.req.method,
+    headers,
+  }) as unknown as Promise<Response>;
+}
@@ -0,0 +1,566 @@
+/**
+ * Per-post Durable Object for editor presence and edit locks.
+ *
+ * One instance exists per post (addressed by `idFromName(postId)`). Presence is
+ * held purely in memory and pushed to connected editors over WebSocket, so
+ * heartbeats never touch D1. The edit lock lives in Durable Object storage and
+ * is only written to D1 when it is acquired, taken over or released, keeping
+ * `post_edit_locks` accurate for the D1 fallback routes and other readers.
+ */
+
+import { eq } from 'drizzle-orm';
+import { nanoid } from 'nanoid';
+import { getDb } from '../../db/client';
+import { postEditLocks } from '../../db/schema';
+import { successResponse, Errors } from '../api/hono-response';
+import type { CloudflareBindings } from '../../types';
+
+// Users not seen within this window are no longer considered present
+export const PRESENCE_TIMEOUT_MS = 2 * 60 * 1000;
+// Edit locks expire after 30 minutes unless refreshed
+export const LOCK_DURATION_MS = 30 * 60 * 1000;
+
+const LOCK_STORAGE_KEY = 'lock';
+// Close code for sockets that stopped sending heartbeats (half-open connections)
+const PRESENCE_TIMEOUT_CLOSE_CODE = 4008;
+
+export interface CollaborationUser {
+  id: string;
+  name: string | null;
+  email: string;
+  avatarUrl: string | null;
+}
+
+/**
+ * Encode the user for the `X-Collaboration-User` header. Header values must be
+ * ByteStrings, so names outside Latin-1 (e.g. Cyrillic) are percent-encoded.
+ */
+export function encodeCollaborationUser(user: CollaborationUser): string {
+  return encodeURIComponent(JSON.stringify(user));
+}
+
+export function decodeCollaborationUser(header: string): CollaborationUser {
+  return JSON.parse(decodeURIComponent(header)) as CollaborationUser;
+}
+
+interface PresenceEntry {
+  user: CollaborationUser;
+  lastSeenAt: number;
+}
+
+interface StoredLock {
+  id: string;
+  postId: string;
+  userId: string;
+  user: CollaborationUser | null;
+  lockedAt: number;
+  expiresAt: number;
+}
+
+interface SocketAttachment {
+  user: CollaborationUser;
+  lastSeenAt: number;
+}
+
+export class PostCollaboration implements DurableObject {
+  private postId: string | null = null;
+  private organizationId: string | null = null;
+  // Presence reported through the HTTP heartbeat fallback
+  private heartbeatPresence = new Map<string, PresenceEntry>();
+  private lock: StoredLock | null = null;
+  private initialized = false;
+
+  constructor(
+    private readonly state: DurableObjectState,
+    private readonly env: CloudflareBindings
+  ) {}
+
+  /**
+   * Load the post's organization and any active lock once per instance lifetime
+   */
+  private async initialize(postId: string): Promise<void> {
+    if (this.initialized) {
+      return;
+    }
+
+    await this.state.blockConcurrencyWhile(async () => {
+      if (this.initialized) {
+        return;
+      }
+
+      const db = getDb(this.env.DB);
+      const post = await db.query.posts.findFirst({
+        where: (p, { eq }) => eq(p.id, postId),
+        columns: { id: true, organizationId: true },
+      });
+
+      if (!post) {
+        // Leave uninitialized so a later request re-checks D1
+        this.organizationId = null;
+        return;
+      }
+
+      this.postId = postId;
+      this.organizationId = post.organizationId;
+
+      // Prefer the lock kept in DO storage (it reflects refreshes); fall back to
+      // D1 for locks acquired before this instance existed
+      const stored = await this.state.storage.get<StoredLock>(LOCK_STORAGE_KEY);
+      if (stored) {
+        this.lock = stored;
+      } else {
+        const now = new Date();
+        const activeLock = await db.query.postEditLocks.findFirst({
+          where: (pl, { eq, and: andFn, gt: gtFn }) => andFn(
+            eq(pl.postId, postId),
+            gtFn(pl.expiresAt, now)
+          ),
+        });
+        if (activeLock) {
+          const lockUser = await db.query.users.findFirst({
+            where: (u, { eq }) => eq(u.id, activeLock.userId),
+            columns: { id: true, name: true, email: true, avatarUrl: true },
+          });
+          this.lock = {
+            id: activeLock.id,
+            postId,
+            userId: activeLock.userId,
+            user: lockUser ?? null,
+            lockedAt: activeLock.lockedAt.getTime(),
+            expiresAt: activeLock.expiresAt.getTime(),
+          };
+        }
+      }
+
+      this.initialized = true;
+    });
+  }
+
+  async fetch(request: Request): Promise<Response> {
+    const url = new URL(request.url);
+    const postId = request.headers.get('X-Post-Id');
+    const organizationId = request.headers.get('X-Organization-Id');
+    const userHeader = request.headers.get('X-Collaboration-User');
+
+    if (!postId || !organizationId || !userHeader) {
+      return Response.json(Errors.badRequest('Missing collaboration context'), { status: 400 });
+    }
+
+    await this.initialize(postId);
+
+    // The post must exist and belong to the caller's organization
+    if (this.organizationId !== organizationId) {
+      return Response.json(Errors.notFound('Post'), { status: 404 });
+    }
+
+    let user: CollaborationUser;
+    try {
+      user = decodeCollaborationUser(userHeader);
+    } catch {
+      return Response.json(Errors.badRequest('Invalid collaboration user'), { status: 400 });
+    }
+    const route = `${request.method} ${url.pathname}`;
+
+    switch (route) {
+      case 'GET /connect':
+        return this.handleConnect(request, user);
+      case 'POST /presence':
+        return this.handleHeartbeat(user);
+      case 'GET /presence':
+        return Response.json(successResponse({ activeUsers: this.getActiveUsers() }));
+      case 'GET /lock':
+        return this.handleGetLock(user);
+      case 'POST /lock':
+        return this.handleAcquireLock(user);
+      case 'DELETE /lock':
+        return this.handleReleaseLock(user);
+      case 'POST /lock/takeover':
+        return this.handleTakeover(user);
+      default:
+        return Response.json(Errors.notFound('Route'), { status: 404 });
+    }
+  }
+
+  private handleConnect(request: Request, user: CollaborationUser): Response {
+    if (request.headers.get('Upgrade')?.toLowerCase() !== 'websocket') {
+      return Response.json(Errors.badRequest('Expected WebSocket upgrade'), { status: 426 });
+    }
+
+    const pair = new WebSocketPair();
+    const [client, server] = Object.values(pair);
+
+    // Hibernatable socket: the DO can be evicted between messages without
+    // dropping the connection, so idle editors cost nothing
+    this.state.acceptWebSocket(server, [user.id]);
+    const attachment: SocketAttachment = { user, lastSeenAt: Date.now() };
+    server.serializeAttachment(attachment);
+
+    server.send(JSON.stringify({
+      type: 'snapshot',
+      activeUsers: this.getActiveUsers(),
+      lock: this.serializeLockStatus(user.id),
+    }));
+    this.broadcastPresence();
+    // Sweep for sockets that go quiet without closing
+    this.scheduleSweep();
+
+    return new Response(null, { status: 101, webSocket: client });
+  }
+
+  async webSocketMessage(ws: WebSocket, message: string | ArrayBuffer): Promise<void> {
+    const attachment = ws.deserializeAttachment() as SocketAttachment | null;
+    if (!attachment) {
+      return;
+    }
+
+    let payload: { type?: string } = {};
+    try {
+      payload = JSON.parse(typeof message === 'string' ? message : new TextDecoder().decode(message));
+    } catch {
+      return;
+    }
+
+    if (payload.type === 'heartbeat') {
+      attachment.lastSeenAt = Date.now();
+      ws.serializeAttachment(attachment);
+    }
+  }
+
+  async webSocketClose(ws: WebSocket, code: number, reason: string): Promise<void> {
+    try {
+      ws.close(code, reason);
+    } catch {
+      // Already closed
+    }
+    this.broadcastPresence([ws]);
+  }
+
+  async webSocketError(ws: WebSocket): Promise<void> {
+    this.broadcastPresence([ws]);
+  }
+
+  /**
+   * Periodic sweep that drops stale heartbeat presence, closes sockets that
+   * stopped sending heartbeats and notifies editors
+   */
+  async alarm(): Promise<void> {
+    const before = this.heartbeatPresence.size;
+    this.pruneHeartbeatPresence();
+    const closedSockets = this.closeStaleSockets();
+    if (this.heartbeatPresence.size !== before || closedSockets.length > 0) {
+      this.broadcastPresence(closedSockets);
+    }
+    if (this.heartbeatPresence.size > 0 || this.getLiveSockets(closedSockets).length > 0) {
+      await this.state.storage.setAlarm(Date.now() + PRESENCE_TIMEOUT_MS);
+    }
+  }
+
+  private async handleHeartbeat(user: CollaborationUser): Promise<Response> {
+    const isNew = !this.heartbeatPresence.has(user.id);
+    this.heartbeatPresence.set(user.id, { user, lastSeenAt: Date.now() });
+
+    if (isNew) {
+      this.broadcastPresence();
+      await this.ensureAlarm();
+    }
+
+    return Response.json(successResponse({ message: 'Presence updated' }));
+  }
+
+  private async ensureAlarm(): Promise<void> {
+    if ((await this.state.storage.getAlarm()) === null) {
+      await this.state.storage.setAlarm(Date.now() + PRESENCE_TIMEOUT_MS);
+    }
+  }
+
+  private scheduleSweep(): void {
+    this.ensureAlarm().catch((error) => {
+      console.error('Failed to schedule presence sweep:', error);
+    });
+  }
+
+  /**
+   * Close sockets whose last heartbeat is older than PRESENCE_TIMEOUT_MS.
+   * A sleeping laptop leaves a half-open connection the runtime may not notice
+   * for a long time, so heartbeats - not the socket state - decide presence.
+   */
+  private closeStaleSockets(): WebSocket[] {
+    const cutoff = Date.now() - PRESENCE_TIMEOUT_MS;
+    const closed: WebSocket[] = [];
+    for (const ws of this.state.getWebSockets()) {
+      const attachment = ws.deserializeAttachment() as SocketAttachment | null;
+      if (attachment && attachment.lastSeenAt > cutoff) {
+        continue;
+      }
+      try {
+        ws.close(PRESENCE_TIMEOUT_CLOSE_CODE, 'Presence timeout');
+      } catch {
+        // Already closed
+      }
+      closed.push(ws);
+    }
+    return closed;
+  }
+
+  private getLiveSockets(exclude: WebSocket[] = []): WebSocket[] {
+    return this.state.getWebSockets().filter((ws) => !exclude.includes(ws));
+  }
+
+  private handleGetLock(user: CollaborationUser): Response {
+    const status = this.serializeLockStatus(user.id);
+    return Response.json(successResponse(status));
+  }
+
+  private async handleAcquireLock(user: CollaborationUser): Promise<Response> {
+    const now = Date.now();
+    const activeLock = this.getActiveLock();
+
+    if (activeLock) {
+      if (activeLock.userId === user.id) {
+        // Refreshing our own lock stays out of D1
+        activeLock.lockedAt = now;
+        activeLock.expiresAt = now + LOCK_DURATION_MS;
+        activeLock.user = user;
+        await this.state.storage.put(LOCK_STORAGE_KEY, activeLock);
+        this.broadcastLock();
+
+        return Response.json(successResponse({
+          lock: this.toLockRow(activeLock),
+          message: 'Lock refreshed',
+        }));
+      }
+
+      return Response.json(Errors.conflict(
+        'Post is currently being edited by another user',
+        {
+          lock: {
+            userId: activeLock.userId,
+            userName: activeLock.user?.name || activeLock.user?.email || 'Unknown',
+            userAvatar: activeLock.user?.avatarUrl,
+            lockedAt: new Date(activeLock.lockedAt),
+            expiresAt: new Date(activeLock.expiresAt),
+          },
+        }
+      ), { status: 409 });
+    }
+
+    const lock = await this.writeLock(user, now);
+    return Response.json(successResponse({
+      lock: this.toLockRow(lock),
+      message: 'Lock acquired',
+    }));
+  }
+
+  private async handleReleaseLock(user: CollaborationUser): Promise<Response> {
+    const activeLock = this.getActiveLock();
+    if (!activeLock) {
+      return Response.json(successResponse({ message: 'No active lock found' }));
+    }
+
+    // Only the lock owner can release
+    if (activeLock.userId !== user.id) {
+      return Response.json(Errors.forbidden(), { status: 403 });
+    }
+
+    await this.clearLock();
+    return Response.json(successResponse({ message: 'Lock released' }));
+  }
+
+  private async handleTakeover(user: CollaborationUser): Promise<Response> {
+    const lock = await this.writeLock(user, Date.now(), this.getActiveLock());
+    return Response.json(successResponse({
+      lock: this.toLockRow(lock),
+      message: 'Lock taken over',
+    }));
+  }
+
+  /**
+   * Claim the lock for `user`, replacing `replaced` (takeover) if given.
+   *
+   * `this.lock` is updated before the first await: D1 calls do not hold the
+   * input gate, so another request can run while the insert is in flight and
+   * must already see the new owner. The claim is rolled back if D1 fails.
+   */
+  private async writeLock(
+    user: CollaborationUser,
+    now: number,
+    replaced: StoredLock | null = null
+  ): Promise<StoredLock> {
+    const lock: StoredLock = {
+      id: nanoid(),
+      postId: this.postId!,
+      userId: user.id,
+      user,
+      lockedAt: now,
+      expiresAt: now + LOCK_DURATION_MS,
+    };
+
+    const previous = this.lock;
+    this.lock = lock;
+    try {
+      await this.state.storage.put(LOCK_STORAGE_KEY, lock);
+
+      const db = getDb(this.env.DB);
+      const insert = db.insert(postEditLocks).values({
+        id: lock.id,
+        postId: lock.postId,
+        userId: lock.userId,
+        lockedAt: new Date(lock.lockedAt),
+        expiresAt: new Date(lock.expiresAt),
+      });
+      if (replaced) {
+        await db.batch([db.delete(postEditLocks).where(eq(postEditLocks.id, replaced.id)), insert]);
+      } else {
+        await insert;
+      }
+    } catch (error) {
+      await this.restoreLock(lock, previous);
+      throw error;
+    }
+
+    this.broadcastLock();
+    return lock;
+  }
+
+  private async clearLock(): Promise<void> {
+    const lock = this.lock;
+    if (!lock) {
+      return;
+    }
+
+    // Released before the D1 call for the same reason as writeLock
+    this.lock = null;
+    try {
+      await this.state.storage.delete(LOCK_STORAGE_KEY);
+      const db = getDb(this.env.DB);
+      await db.delete(postEditLocks).where(eq(postEditLocks.id, lock.id));
+    } catch (error) {
+      await this.restoreLock(null, lock);
+      throw error;
+    }
+
+    this.broadcastLock();
+  }
+
+  /**
+   * Undo a failed claim or release, unless another request changed the lock since
+   */
+  private async restoreLock(expected: StoredLock | null, previous: StoredLock | null): Promise<void> {
+    if (this.lock !== expected) {
+      return;
+    }
+    this.lock = previous;
+    if (previous) {
+      await this.state.storage.put(LOCK_STORAGE_KEY, previous);
+    } else {
+      await this.state.storage.delete(LOCK_STORAGE_KEY);
+    }
+  }
+
+  private getActiveLock(): StoredLock | null {
+    if (this.lock && this.lock.expiresAt <= Date.now()) {
+      return null;
+    }
+    return this.lock;
+  }
+
+  private toLockRow(lock: StoredLock) {
+    return {
+      id: lock.id,
+      postId: lock.postId,
+      userId: lock.userId,
+      lockedAt: new Date(lock.lockedAt),
+      expiresAt: new Date(lock.expiresAt),
+    };
+  }
+
+  private serializeLockStatus(userId: string) {
+    const activeLock = this.getActiveLock();
+    if (!activeLock) {
+      return { locked: false, lock: null };
+    }
+
+    return {
+      locked: true,
+      lock: {
+        id: activeLock.id,
+        userId: activeLock.userId,
+        userName: activeLock.user?.name || activeLock.user?.email || 'Unknown',
+        userAvatar: activeLock.user?.avatarUrl,
+        lockedAt: new Date(activeLock.lockedAt),
+        expiresAt: new Date(activeLock.expiresAt),
+        isOwner: activeLock.userId === userId,
+      },
+    };
+  }
+
+  private pruneHeartbeatPresence(): void {
+    const cutoff = Date.now() - PRESENCE_TIMEOUT_MS;
+    for (const [userId, entry] of this.heartbeatPresence) {
+      if (entry.lastSeenAt <= cutoff) {
+        this.heartbeatPresence.delete(userId);
+      }
+    }
+  }
+
+  /**
+   * Merge WebSocket-connected editors with heartbeat presence, most recent first
+   */
+  private getActiveUsers(exclude: WebSocket[] = []) {
+    this.pruneHeartbeatPresence();
+
+    const cutoff = Date.now() - PRESENCE_TIMEOUT_MS;
+    const entries = new Map<string, PresenceEntry>(this.heartbeatPresence);
+    for (const ws of this.getLiveSockets(exclude)) {
+      const attachment = ws.deserializeAttachment() as SocketAttachment | null;
+      // Stale sockets are closed by the alarm; never report them as present
+      if (!attachment || attachment.lastSeenAt <= cutoff) {
+        continue;
+      }
+      const existing = entries.get(attachment.user.id);
+      if (!existing || existing.lastSeenAt < attachment.lastSeenAt) {
+        entries.set(attachment.user.id, attachment);
+      }
+    }
+
+    return Array.from(entries.values())
+      .sort((a, b) => b.lastSeenAt - a.lastSeenAt)
+      .map(({ user, lastSeenAt }) => ({
+        id: user.id,
+        name: user.name,
+        email: user.email,
+        avatarUrl: user.avatarUrl,
+        lastSeenAt: new Date(lastSeenAt),
+      }));
+  }
+
+  private broadcast(message: unknown, exclude: WebSocket[] = []): void {
+    const data = JSON.stringify(message);
+    for (const ws of this.getLiveSockets(exclude)) {
+      try {
+        ws.send(data);
+      } catch {
+        // Socket already closed; the runtime will deliver webSocketClose
+      }
+    }
+  }
+
+  private broadcastPresence(exclude: WebSocket[] = []): void {
+    this.broadcast({ type: 'presence', activeUsers: this.getActiveUsers(exclude) }, exclude);
+  }
+
+  private broadcastLock(): void {
+    // Each socket gets its own isOwner flag
+    for (const ws of this.state.getWebSockets()) {
+      const attachment = ws.deserializeAttachment() as SocketAttachment | null;
+      if (!attachment) {
+        continue;
+      }
+      try {
+        ws.send(JSON.stringify({ type: 'lock', ...this.serializeLockStatus(attachment.user.id) }));
+      } catch {
+        // Socket already closed
+      }
+    }
+  }
+}
@@ -0,0 +1,268 @@
+/**
+ * Query depth and cost analysis for the GraphQL endpoint.
+ *
+ * Runs against the parsed document before execution so expensive queries are
+ * rejected without touching D1. Cost is estimated as one unit per resolved field,
+ * multiplied by the expected list size for fields that return lists (the `limit`
+ * argument when present, otherwise DEFAULT_LIST_SIZE).
+ *
+ * Resolvers must page with resolveListLimit() so the limit they execute is the
+ * same one the cost model charged for.
+ */
+
+import {
+  Kind,
+  getNamedType,
+  getNullableType,
+  isListType,
+  isObjectType,
+  isInterfaceType,
+  type DocumentNode,
+  type FieldNode,
+  type FragmentDefinitionNode,
+  type GraphQLCompositeType,
+  type GraphQLSchema,
+  type OperationDefinitionNode,
+  type SelectionSetNode,
+  type ValueNode,
+} from 'graphql';
+
+export const MAX_QUERY_DEPTH = 8;
+export const MAX_QUERY_COST = 5000;
+
+// Expected number of items for list fields without an explicit `limit` argument
+export const DEFAULT_LIST_SIZE = 20;
+// Hard cap on `limit` for list fields, regardless of what the query asks for
+export const MAX_LIST_LIMIT = 100;
+
+export interface QueryComplexity {
+  depth: number;
+  cost: number;
+  // Argument problems found while costing (e.g. non-positive limits)
+  errors: string[];
+}
+
+/**
+ * Validate and clamp a list `limit` argument.
+ * Missing/null limits use DEFAULT_LIST_SIZE, larger ones are capped at MAX_LIST_LIMIT.
+ * Throws for zero or negative limits (SQLite treats LIMIT -1 as "no limit").
+ */
+export function resolveListLimit(limit: number | null | undefined): number {
+  if (limit === null || limit === undefined) {
+    return DEFAULT_LIST_SIZE;
+  }
+  if (!Number.isInteger(limit) || limit <= 0) {
+    throw new Error(`limit must be a positive integer, got ${limit}`);
+  }
+  return Math.min(limit, MAX_LIST_LIMIT);
+}
+
+export interface ComplexityLimits {
+  maxDepth?: number;
+  maxCost?: number;
+}
+
+/**
+ * Find the operation that will be executed (mirrors graphql-js selection rules)
+ */
+function getOperation(
+  document: DocumentNode,
+  operationName?: string | null
+): OperationDefinitionNode | null {
+  const operations = document.definitions.filter(
+    (definition): definition is OperationDefinitionNode => definition.kind === Kind.OPERATION_DEFINITION
+  );
+  if (operationName) {
+    return operations.find((operation) => operation.name?.value === operationName) ?? null;
+  }
+  return operations.length === 1 ? operations[0] : null;
+}
+
+/**
+ * Resolve an Int argument the way execution will see it: literal, supplied
+ * variable, or the variable's default value when it was not supplied
+ */
+function resolveIntArgument(
+  value: ValueNode | undefined,
+  variables: Record<string, unknown> | undefined,
+  variableDefaults: Map<string, ValueNode>
+): number | null {
+  if (!value) {
+    return null;
+  }
+  if (value.kind === Kind.INT) {
+    return parseInt(value.value, 10);
+  }
+  if (value.kind === Kind.VARIABLE) {
+    const name = value.name.value;
+    if (variables && Object.prototype.hasOwnProperty.call(variables, name)) {
+      const variable = variables[name];
+      return typeof variable === 'number' ? variable : null;
+    }
+    return resolveIntArgument(variableDefaults.get(name), undefined, variableDefaults);
+  }
+  return null;
+}
+
+/**
+ * Analyze depth and estimated cost of the selected operation.
+ * Returns null when the operation cannot be found (graphql-js reports that itself).
+ */
+export function analyzeQueryComplexity(
+  schema: GraphQLSchema,
+  document: DocumentNode,
+  operationName?: string | null,
+  variables?: Record<string, unknown>
+): QueryComplexity | null {
+  const operation = getOperation(document, operationName);
+  if (!operation) {
+    return null;
+  }
+
+  const rootType =
+    operation.operation === 'mutation' ? schema.getMutationType() : schema.getQueryType();
+  if (!rootType) {
+    return null;
+  }
+
+  const variableDefaults = new Map<string, ValueNode>();
+  for (const definition of operation.variableDefinitions ?? []) {
+    if (definition.defaultValue) {
+      variableDefaults.set(definition.variable.name.value, definition.defaultValue);
+    }
+  }
+
+  const errors: string[] = [];
+  const fragments = new Map<string, FragmentDefinitionNode>();
+  for (const definition of document.definitions) {
+    if (definition.kind === Kind.FRAGMENT_DEFINITION) {
+      fragments.set(definition.name.value, definition);
+    }
+  }
+
+  const visitSelectionSet = (
+    selectionSet: SelectionSetNode,
+    parentType: GraphQLCompositeType,
+    depth: number,
+    visitedFragments: Set<string>
+  ): Omit<QueryComplexity, 'errors'> => {
+    let maxDepth = depth;
+    let cost = 0;
+
+    for (const selection of selectionSet.selections) {
+      let result: Omit<QueryComplexity, 'errors'>;
+
+      if (selection.kind === Kind.FIELD) {
+        result = visitField(selection, parentType, depth, visitedFragments);
+      } else if (selection.kind === Kind.INLINE_FRAGMENT) {
+        const typeName = selection.typeCondition?.name.value;
+        const fragmentType = typeName ? schema.getType(typeName) : parentType;
+        if (!fragmentType || !(isObjectType(fragmentType) || isInterfaceType(fragmentType))) {
+          continue;
+        }
+        result = visitSelectionSet(selection.selectionSet, fragmentType, depth, visitedFragments);
+      } else {
+        const name = selection.name.value;
+        const fragment = fragments.get(name);
+        // Fragment cycles are rejected by validation; guard anyway
+        if (!fragment || visitedFragments.has(name)) {
+          continue;
+        }
+        const fragmentType = schema.getType(fragment.typeCondition.name.value);
+        if (!fragmentType || !(isObjectType(fragmentType) || isInterfaceType(fragmentType))) {
+          continue;
+        }
+        result = visitSelectionSet(
+          fragment.selectionSet,
+          fragmentType,
+          depth,
+          new Set([...visitedFragments, name])
+        );
+      }
+
+      maxDepth = Math.max(maxDepth, result.depth);
+      cost += result.cost;
+    }
+
+    return { depth: maxDepth, cost };
+  };
+
+  const visitField = (
+    field: FieldNode,
+    parentType: GraphQLCompositeType,
+    depth: number,
+    visitedFragments: Set<string>
+  ): Omit<QueryComplexity, 'errors'> => {
+    // Introspection meta-fields are cheap and never hit the database
+    if (field.name.value.startsWith('__')) {
+      return { depth, cost: 0 };
+    }
+
+    if (!isObjectType(parentType) && !isInterfaceType(parentType)) {
+      return { depth, cost: 1 };
+    }
+
+    const fieldDef = parentType.getFields()[field.name.value];
+    if (!fieldDef) {
+      return { depth, cost: 1 };
+    }
+
+    const fieldDepth = depth + 1;
+    if (!field.selectionSet) {
+      return { depth: fieldDepth, cost: 1 };
+    }
+
+    const namedType = getNamedType(fieldDef.type);
+    if (!isObjectType(namedType) && !isInterfaceType(namedType)) {
+      return { depth: fieldDepth, cost: 1 };
+    }
+
+    let multiplier = 1;
+    if (isListType(getNullableType(fieldDef.type))) {
+      const limitArg = field.arguments?.find((arg) => arg.name.value === 'limit');
+      try {
+        multiplier = resolveListLimit(resolveIntArgument(limitArg?.value, variables, variableDefaults));
+      } catch (error) {
+        errors.push(`${field.name.value}: ${(error as Error).message}`);
+        multiplier = DEFAULT_LIST_SIZE;
+      }
+    }
+
+    const children = visitSelectionSet(field.selectionSet, namedType, fieldDepth, visitedFragments);
+    return { depth: children.depth, cost: 1 + multiplier * children.cost };
+  };
+
+  const { depth, cost } = visitSelectionSet(operation.selectionSet, rootType, 0, new Set());
+  return { depth, cost, errors };
+}
+
+/**
+ * Check a document against depth/cost limits.
+ * Returns an error message when a limit is exceeded, otherwise null.
+ */
+export function checkQueryComplexity(
+  schema: GraphQLSchema,
+  document: DocumentNode,
+  operationName?: string | null,
+  variables?: Record<string, unknown>,
+  limits: ComplexityLimits = {}
+): string | null {
+  const maxDepth = limits.maxDepth ?? MAX_QUERY_DEPTH;
+  const maxCost = limits.maxCost ?? MAX_QUERY_COST;
+
+  const complexity = analyzeQueryComplexity(schema, document, operationName, variables);
+  if (!complexity) {
+    return null;
+  }
+
+  if (complexity.errors.length > 0) {
+    return complexity.errors.join('; ');
+  }
+  if (complexity.depth > maxDepth) {
+    return `Query depth ${complexity.depth} exceeds maximum allowed depth of ${maxDepth}`;
+  }
+  if (complexity.cost > maxCost) {
+    return `Query cost ${complexity.cost} exceeds maximum allowed cost of ${maxCost}`;
+  }
+  return null;
+}
@@ -0,0 +1,224 @@
+/**
+ * Per-request batching loaders for GraphQL resolvers.
+ *
+ * Field resolvers call `loaders.x.load(key)` instead of querying D1 directly.
+ * Keys requested during the same tick are collected and resolved with a single
+ * `inArray` query per loader, so a list of N posts costs one query per related
+ * entity type instead of N. Results are memoised for the lifetime of the request.
+ */
+
+import type { DbClient } from '@/db/client';
+import { eq, inArray } from 'drizzle-orm';
+import {
+  organizations,
+  posts,
+  users,
+  postTypes,
+  taxonomyTerms,
+  postTaxonomies,
+  postFieldValues,
+  customFields,
+  media,
+  type Organization,
+  type Post,
+  type User,
+  type PostType,
+  type TaxonomyTerm,
+  type Media,
+} from '@/db/schema';
+
+// D1 caps bound parameters per statement at 100, so larger key sets are split
+const MAX_KEYS_PER_QUERY = 90;
+
+type BatchLoadFn<K, V> = (keys: K[]) => Promise<Map<K, V>>;
+
+/**
+ * Minimal DataLoader: batches `load()` calls made in the same microtask and
+ * caches each key's promise for the rest of the request.
+ */
+export class BatchLoader<K, V> {
+  private cache = new Map<K, Promise<V | null>>();
+  private queue: Array<{ key: K; resolve: (value: V | null) => void; reject: (error: unknown) => void }> = [];
+
+  constructor(private readonly batchFn: BatchLoadFn<K, V>) {}
+
+  load(key: K): Promise<V | null> {
+    const cached = this.cache.get(key);
+    if (cached) {
+      return cached;
+    }
+
+    const promise = new Promise<V | null>((resolve, reject) => {
+      this.queue.push({ key, resolve, reject });
+      if (this.queue.length === 1) {
+        queueMicrotask(() => this.dispatch());
+      }
+    });
+    this.cache.set(key, promise);
+    return promise;
+  }
+
+  loadMany(keys: K[]): Promise<Array<V | null>> {
+    return Promise.all(keys.map((key) => this.load(key)));
+  }
+
+  /**
+   * Seed the cache with an already-loaded value (e.g. rows returned by a list query)
+   */
+  prime(key: K, value: V): void {
+    if (!this.cache.has(key)) {
+      this.cache.set(key, Promise.resolve(value));
+    }
+  }
+
+  private async dispatch(): Promise<void> {
+    const batch = this.queue;
+    this.queue = [];
+
+    const keys = Array.from(new Set(batch.map((item) => item.key)));
+    try {
+      const results = new Map<K, V>();
+      for (let i = 0; i < keys.length; i += MAX_KEYS_PER_QUERY) {
+        const chunk = await this.batchFn(keys.slice(i, i + MAX_KEYS_PER_QUERY));
+        chunk.forEach((value, key) => results.set(key, value));
+      }
+      for (const item of batch) {
+        item.resolve(results.get(item.key) ?? null);
+      }
+    } catch (error) {
+      for (const item of batch) {
+        // Don't keep failed keys cached so a retry can succeed
+        this.cache.delete(item.key);
+        item.reject(error);
+      }
+    }
+  }
+}
+
+function indexBy<T, K>(rows: T[], getKey: (row: T) => K): Map<K, T> {
+  const map = new Map<K, T>();
+  for (const row of rows) {
+    map.set(getKey(row), row);
+  }
+  return map;
+}
+
+function groupBy<T, K>(rows: T[], getKey: (row: T) => K): Map<K, T[]> {
+  const map = new Map<K, T[]>();
+  for (const row of rows) {
+    const key = getKey(row);
+    const group = map.get(key);
+    if (group) {
+      group.push(row);
+    } else {
+      map.set(key, [row]);
+    }
+  }
+  return map;
+}
+
+export interface PostFieldValueWithField {
+  customFieldId: string;
+  slug: string;
+  name: string;
+  fieldType: string;
+  value: string | null;
+}
+
+export interface GraphQLLoaders {
+  organizations: BatchLoader<string, Organization>;
+  posts: BatchLoader<string, Post>;
+  users: BatchLoader<string, User>;
+  postTypes: BatchLoader<string, PostType>;
+  media: BatchLoader<string, Media>;
+  termsByTaxonomyId: BatchLoader<string, TaxonomyTerm[]>;
+  termsByPostId: BatchLoader<string, TaxonomyTerm[]>;
+  fieldValuesByPostId: BatchLoader<string, PostFieldValueWithField[]>;
+}
+
+/**
+ * Create a fresh set of loaders. Must be called once per request so cached
+ * rows never leak between users or organizations.
+ */
+export function createLoaders(db: DbClient): GraphQLLoaders {
+  return {
+    organizations: new BatchLoader(async (ids) =>
+      indexBy(
+        await db.select().from(organizations).where(inArray(organizations.id, ids)),
+        (row) => row.id
+      )
+    ),
+
+    posts: new BatchLoader(async (ids) =>
+      indexBy(
+        await db.select().from(posts).where(inArray(posts.id, ids)),
+        (row) => row.id
+      )
+    ),
+
+    users: new BatchLoader(async (ids) =>
+      indexBy(
+        await db.select().from(users).where(inArray(users.id, ids)),
+        (row) => row.id
+      )
+    ),
+
+    postTypes: new BatchLoader(async (ids) =>
+      indexBy(
+        await db.select().from(postTypes).where(inArray(postTypes.id, ids)),
+        (row) => row.id
+      )
+    ),
+
+    media: new BatchLoader(async (ids) =>
+      indexBy(
+        await db.select().from(media).where(inArray(media.id, ids)),
+        (row) => row.id
+      )
+    ),
+
+    termsByTaxonomyId: new BatchLoader(async (taxonomyIds) => {
+      const rows = await db
+        .select()
+        .from(taxonomyTerms)
+        .where(inArray(taxonomyTerms.taxonomyId, taxonomyIds));
+      const grouped = groupBy(rows, (row) => row.taxonomyId);
+      // Taxonomies without terms resolve to an empty list rather than null
+      return new Map(taxonomyIds.map((id) => [id, grouped.get(id) ?? []]));
+    }),
+
+    termsByPostId: new BatchLoader(async (postIds) => {
+      const rows = await db
+        .select({ postId: postTaxonomies.postId, term: taxonomyTerms })
+        .from(postTaxonomies)
+        .innerJoin(taxonomyTerms, eq(taxonomyTerms.id, postTaxonomies.taxonomyTermId))
+        .where(inArray(postTaxonomies.postId, postIds));
+      const grouped = groupBy(rows, (row) => row.postId);
+      return new Map(
+        postIds.map((id) => [id, (grouped.get(id) ?? []).map((row) => row.term)])
+      );
+    }),
+
+    fieldValuesByPostId: new BatchLoader(async (postIds) => {
+      const rows = await db
+        .select({
+          postId: postFieldValues.postId,
+          customFieldId: postFieldValues.customFieldId,
+          slug: customFields.slug,
+          name: customFields.name,
+          fieldType: customFields.fieldType,
+          value: postFieldValues.value,
+        })
+        .from(postFieldValues)
+        .innerJoin(customFields, eq(customFields.id, postFieldValues.customFieldId))
+        .where(inArray(postFieldValues.postId, postIds));
+      const grouped = groupBy(rows, (row) => row.postId);
+      return new Map(
+        postIds.map((id) => [
+          id,
+          (grouped.get(id) ?? []).map(({ postId: _postId, ...fieldValue }) => fieldValue),
+        ])
+      );
+    }),
+  };
+}
@@ -0,0 +1,113 @@
+/**
+ * Persisted query cache for the GraphQL endpoint.
+ *
+ * Parsed and validated documents are kept in isolate memory keyed by the
+ * SHA-256 of the query text, so repeated queries skip parse/validate entirely.
+ * Clients may also use the Apollo automatic persisted query protocol
+ * (`extensions.persistedQuery.sha256Hash`) and send only the hash once the
+ * document has been registered.
+ */
+
+import { parse, validate, type DocumentNode, type GraphQLSchema } from 'graphql';
+
+// Upper bound on cached documents per isolate; oldest entries are evicted first
+const MAX_PERSISTED_QUERIES = 500;
+
+export interface PersistedQueryExtension {
+  version?: number;
+  sha256Hash?: string;
+}
+
+export type CompiledQueryResult =
+  | { ok: true; hash: string; document: DocumentNode }
+  | { ok: false; code: 'PERSISTED_QUERY_NOT_FOUND' | 'PERSISTED_QUERY_HASH_MISMATCH' | 'GRAPHQL_VALIDATION_FAILED' | 'BAD_REQUEST'; messages: string[] };
+
+const documentCache = new Map<string, DocumentNode>();
+
+/**
+ * Compute the hex-encoded SHA-256 hash of a query string
+ */
+export async function hashQuery(query: string): Promise<string> {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(query));
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, '0'))
+    .join('');
+}
+
+function rememberDocument(hash: string, document: DocumentNode): void {
+  if (documentCache.size >= MAX_PERSISTED_QUERIES) {
+    // Map preserves insertion order, so the first key is the oldest entry
+    const oldest = documentCache.keys().next().value;
+    if (oldest !== undefined) {
+      documentCache.delete(oldest);
+    }
+  }
+  documentCache.set(hash, document);
+}
+
+/**
+ * Resolve a request's query text and/or persisted query hash to a validated document.
+ * Only documents that pass schema validation are cached.
+ */
+export async function getCompiledQuery(
+  schema: GraphQLSchema,
+  query: string | undefined,
+  persistedQuery?: PersistedQueryExtension
+): Promise<CompiledQueryResult> {
+  const requestedHash = persistedQuery?.sha256Hash;
+
+  if (!query) {
+    if (!requestedHash) {
+      return { ok: false, code: 'BAD_REQUEST', messages: ['GraphQL query is required'] };
+    }
+    const document = documentCache.get(requestedHash);
+    if (!document) {
+      return { ok: false, code: 'PERSISTED_QUERY_NOT_FOUND', messages: ['PersistedQueryNotFound'] };
+    }
+    return { ok: true, hash: requestedHash, document };
+  }
+
+  const hash = await hashQuery(query);
+  if (requestedHash && requestedHash !== hash) {
+    return {
+      ok: false,
+      code: 'PERSISTED_QUERY_HASH_MISMATCH',
+      messages: ['Provided sha256Hash does not match query'],
+    };
+  }
+
+  const cached = documentCache.get(hash);
+  if (cached) {
+    return { ok: true, hash, document: cached };
+  }
+
+  let document: DocumentNode;
+  try {
+    document = parse(query);
+  } catch (error) {
+    return {
+      ok: false,
+      code: 'GRAPHQL_VALIDATION_FAILED',
+      messages: [error instanceof Error ? error.message : 'Failed to parse query'],
+    };
+  }
+
+  const validationErrors = validate(schema, document);
+  if (validationErrors.length > 0) {
+    return {
+      ok: false,
+      code: 'GRAPHQL_VALIDATION_FAILED',
+      messages: validationErrors.map((error) => error.message),
+    };
+  }
+
+  rememberDocument(hash, document);
+  return { ok: true, hash, document };
+}
+
+/**
+ * Clear all cached documents (used by tests)
+ */
+export function clearPersistedQueries(): void {
+  documentCache.clear();
+}
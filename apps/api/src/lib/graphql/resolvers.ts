@@ -1,14 +1,29 @@
 import type { DbClient } from '@/db/client';
 import { eq, and } from 'drizzle-orm';
 import { nanoid } from 'nanoid';
-import { posts, organizations, postTypes, taxonomies, media } from '@/db/schema';
+import { posts, organizations, postTypes, taxonomies, media, type Post, type Taxonomy } from '@/db/schema';
+import type { GraphQLLoaders, PostFieldValueWithField } from './loaders';
+import { resolveListLimit } from './complexity';
 
 export interface GraphQLContext {
   db: DbClient;
+  // Per-request batching loaders - nested fields must go through these
+  loaders: GraphQLLoaders;
   organizationId?: string;
   user?: { id: string; email: string };
 }
 
+/**
+ * Prime the post loader with rows from a list query so later lookups of the
+ * same posts within this request don't re-query them
+ */
+function primePosts(context: GraphQLContext, result: Post[]): Post[] {
+  for (const post of result) {
+    context.loaders.posts.prime(post.id, post);
+  }
+  return result;
+}
+
 export const resolvers = {
   Query: {
     posts: async (
@@ -21,15 +36,13 @@ export const resolvers = {
         conditions.push(eq(posts.status, args.status));
       }
 
-      return context.db.query.posts.findMany({
+      const result = await context.db.query.posts.findMany({
         where: and(...conditions),
-        limit: args.limit || 20,
-        offset: args.offset || 0,
-        with: {
-          author: true,
-          postType: true,
-        },
+        // Same clamping as the cost model in complexity.ts
+        limit: resolveListLimit(args.limit),
+        offset: Math.max(0, args.offset ?? 0),
       });
+      return primePosts(context, result);
     },
 
     post: async (
@@ -37,16 +50,8 @@ export const resolvers = {
       args: { organizationId: string; postId: string },
       context: GraphQLContext
     ) => {
-      return context.db.query.posts.findFirst({
-        where: and(
-          eq(posts.id, args.postId),
-          eq(posts.organizationId, args.organizationId)
-        ),
-        with: {
-          author: true,
-          postType: true,
-        },
-      });
+      const post = await context.loaders.posts.load(args.postId);
+      return post && post.organizationId === args.organizationId ? post : null;
     },
 
     postBySlug: async (
@@ -54,25 +59,26 @@ export const resolvers = {
       args: { organizationSlug: string; postSlug: string },
       context: GraphQLContext
     ) => {
-      const org = await context.db.query.organizations.findFirst({
-        where: eq(organizations.slug, args.organizationSlug),
-      });
+      // Resolve organization and post in one statement; the organization is
+      // primed so a nested `organization` field doesn't query it again
+      const [row] = await context.db
+        .select({ post: posts, organization: organizations })
+        .from(posts)
+        .innerJoin(organizations, eq(organizations.id, posts.organizationId))
+        .where(and(
+          eq(organizations.slug, args.organizationSlug),
+          eq(posts.slug, args.postSlug),
+          eq(posts.status, 'published')
+        ))
+        .limit(1);
 
-      if (!org) {
+      if (!row) {
         return null;
       }
 
-      return context.db.query.posts.findFirst({
-        where: and(
-          eq(posts.organizationId, org.id),
-          eq(posts.slug, args.postSlug),
-          eq(posts.status, 'published')
-        ),
-        with: {
-          author: true,
-          postType: true,
-        },
-      });
+      context.loaders.organizations.prime(row.organization.id, row.organization);
+      context.loaders.posts.prime(row.post.id, row.post);
+      return row.post;
     },
 
     postTypes: async (
@@ -80,9 +86,13 @@ export const resolvers = {
       args: { organizationId: string },
       context: GraphQLContext
     ) => {
-      return context.db.query.postTypes.findMany({
+      const result = await context.db.query.postTypes.findMany({
         where: eq(postTypes.organizationId, args.organizationId),
       });
+      for (const postType of result) {
+        context.loaders.postTypes.prime(postType.id, postType);
+      }
+      return result;
     },
 
     taxonomies: async (
@@ -92,9 +102,6 @@ export const resolvers = {
     ) => {
       return context.db.query.taxonomies.findMany({
         where: eq(taxonomies.organizationId, args.organizationId),
-        with: {
-          terms: true,
-        },
       });
     },
 
@@ -108,9 +115,6 @@ export const resolvers = {
           eq(taxonomies.id, args.taxonomyId),
           eq(taxonomies.organizationId, args.organizationId)
         ),
-        with: {
-          terms: true,
-        },
       });
     },
 
@@ -119,11 +123,16 @@ export const resolvers = {
       args: { organizationId: string; limit?: number; offset?: number },
       context: GraphQLContext
     ) => {
-      return context.db.query.media.findMany({
+      const result = await context.db.query.media.findMany({
         where: eq(media.organizationId, args.organizationId),
-        limit: args.limit || 20,
-        offset: args.offset || 0,
+        // Same clamping as the cost model in complexity.ts
+        limit: resolveListLimit(args.limit),
+        offset: Math.max(0, args.offset ?? 0),
       });
+      for (const item of result) {
+        context.loaders.media.prime(item.id, item);
+      }
+      return result;
     },
 
     mediaItem: async (
@@ -140,6 +149,47 @@ export const resolvers = {
     },
   },
 
+  // Nested fields resolve through the per-request loaders so a list of N parents
+  // costs one batched query per relation instead of N
+  Post: {
+    author: (post: Post, _args: unknown, context: GraphQLContext) =>
+      context.loaders.users.load(post.authorId),
+
+    postType: (post: Post, _args: unknown, context: GraphQLContext) =>
+      context.loaders.postTypes.load(post.postTypeId),
+
+    organization: (post: Post, _args: unknown, context: GraphQLContext) =>
+      context.loaders.organizations.load(post.organizationId),
+
+    featuredImage: (post: Post, _args: unknown, context: GraphQLContext) =>
+      post.featuredImageId ? context.loaders.media.load(post.featuredImageId) : null,
+
+    terms: async (post: Post, _args: unknown, context: GraphQLContext) =>
+      (await context.loaders.termsByPostId.load(post.id)) ?? [],
+
+    fieldValues: async (post: Post, _args: unknown, context: GraphQLContext) =>
+      (await context.loaders.fieldValuesByPostId.load(post.id)) ?? [],
+  },
+
+  PostFieldValue: {
+    // Values are stored as JSON strings for complex types
+    value: (fieldValue: PostFieldValueWithField) => {
+      if (fieldValue.value === null) {
+        return null;
+      }
+      try {
+        return JSON.parse(fieldValue.value);
+      } catch {
+        return fieldValue.value;
+      }
+    },
+  },
+
+  Taxonomy: {
+    terms: async (taxonomy: Taxonomy, _args: unknown, context: GraphQLContext) =>
+      (await context.loaders.termsByTaxonomyId.load(taxonomy.id)) ?? [],
+  },
+
   Mutation: {
     createPost: async (
       _parent: unknown,
@@ -198,10 +248,6 @@ export const resolvers = {
 
       return context.db.query.posts.findFirst({
         where: eq(posts.id, post.id),
-        with: {
-          author: true,
-          postType: true,
-        },
       });
     },
 
@@ -271,10 +317,6 @@ export const resolvers = {
 
       return context.db.query.posts.findFirst({
         where: eq(posts.id, args.postId),
-        with: {
-          author: true,
-          postType: true,
-        },
       });
     },
 
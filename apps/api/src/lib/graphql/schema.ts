@@ -29,6 +29,18 @@ export const typeDefs = `
     updatedAt: DateTime!
     author: User!
     postType: PostType!
+    organization: Organization!
+    featuredImage: Media
+    terms: [TaxonomyTerm!]!
+    fieldValues: [PostFieldValue!]!
+  }
+
+  type PostFieldValue {
+    customFieldId: ID!
+    slug: String!
+    name: String!
+    fieldType: String!
+    value: JSON
   }
 
   type PostType {
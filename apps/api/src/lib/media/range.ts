@@ -0,0 +1,114 @@
+/**
+ * HTTP byte-range helpers for serving media from R2.
+ *
+ * Only single `bytes=` ranges are supported. Multi-range requests would need a
+ * multipart/byteranges body that R2 cannot produce in one read, so they are
+ * reported separately and rejected by the caller with 416.
+ */
+
+export interface ByteRange {
+  /** First byte offset (inclusive) */
+  start: number;
+  /** Last byte offset (inclusive) */
+  end: number;
+}
+
+export type RangeParseResult =
+  | { type: 'none' }
+  | { type: 'range'; range: ByteRange }
+  | { type: 'multiple' }
+  | { type: 'unsatisfiable' };
+
+/**
+ * Parse a `Range` header against an object of known size.
+ *
+ * Returns `none` when the header is absent or malformed (RFC 9110 says an
+ * invalid Range header should be ignored and the full representation served).
+ */
+export function parseRangeHeader(header: string | null | undefined, size: number): RangeParseResult {
+  if (!header) {
+    return { type: 'none' };
+  }
+
+  const match = /^\s*bytes\s*=\s*(.+)$/i.exec(header);
+  if (!match) {
+    return { type: 'none' };
+  }
+
+  const specs = match[1].split(',').map((spec) => spec.trim()).filter(Boolean);
+  if (specs.length === 0) {
+    return { type: 'none' };
+  }
+  if (specs.length > 1) {
+    return { type: 'multiple' };
+  }
+
+  const specMatch = /^(\d*)\s*-\s*(\d*)$/.exec(specs[0]);
+  if (!specMatch || (specMatch[1] === '' && specMatch[2] === '')) {
+    return { type: 'none' };
+  }
+
+  const [, startStr, endStr] = specMatch;
+
+  // Suffix range: "bytes=-500" means the last 500 bytes
+  if (startStr === '') {
+    const suffixLength = parseInt(endStr, 10);
+    if (suffixLength === 0 || size === 0) {
+      return { type: 'unsatisfiable' };
+    }
+    const start = Math.max(size - suffixLength, 0);
+    return { type: 'range', range: { start, end: size - 1 } };
+  }
+
+  const start = parseInt(startStr, 10);
+  const requestedEnd = endStr === '' ? size - 1 : parseInt(endStr, 10);
+
+  if (requestedEnd < start) {
+    return { type: 'none' };
+  }
+  if (start >= size) {
+    return { type: 'unsatisfiable' };
+  }
+
+  return { type: 'range', range: { start, end: Math.min(requestedEnd, size - 1) } };
+}
+
+/**
+ * Decide whether a conditional `If-Range` header still matches the stored object.
+ * If it does not, the Range header must be ignored and the full body served.
+ */
+export function isIfRangeSatisfied(
+  ifRange: string | null | undefined,
+  object: { httpEtag?: string; uploaded?: Date }
+): boolean {
+  if (!ifRange) {
+    return true;
+  }
+
+  const value = ifRange.trim();
+
+  // Entity tag form - weak validators never match for If-Range
+  if (value.startsWith('"') || value.startsWith('W/')) {
+    return !value.startsWith('W/') && !!object.httpEtag && value === object.httpEtag;
+  }
+
+  // HTTP-date form - must exactly match Last-Modified (second precision)
+  if (!object.uploaded) {
+    return false;
+  }
+  const since = Date.parse(value);
+  if (Number.isNaN(since)) {
+    return false;
+  }
+  return Math.floor(new Date(object.uploaded).getTime() / 1000) === Math.floor(since / 1000);
+}
+
+/**
+ * Format a `Content-Range` header value
+ */
+export function formatContentRange(range: ByteRange | null, size: number): string {
+  if (!range) {
+    return `bytes */${size}`;
+  }
+  return `bytes ${range.start}-${range.end}/${size}`;
+}
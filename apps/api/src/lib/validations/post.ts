@@ -61,5 +61,38 @@ export const updatePostSchema = z.object({
   autoSave: z.boolean().optional().default(false), // Flag to indicate auto-save
 });
 
+// Max items per batch request (posts:batchGet / posts:batchUpsert)
+export const MAX_POST_BATCH_SIZE = 100;
+
+export const batchGetPostsSchema = z
+  .object({
+    ids: z.array(z.string().min(1)).max(MAX_POST_BATCH_SIZE).optional(),
+    slugs: z.array(z.string().min(1)).max(MAX_POST_BATCH_SIZE).optional(),
+    postTypeId: z.string().optional(), // Disambiguates slugs shared across post types
+  })
+  .refine((val) => (val.ids?.length ?? 0) + (val.slugs?.length ?? 0) > 0, {
+    message: 'Provide ids or slugs',
+  })
+  .refine((val) => (val.ids?.length ?? 0) + (val.slugs?.length ?? 0) <= MAX_POST_BATCH_SIZE, {
+    message: `At most ${MAX_POST_BATCH_SIZE} ids and slugs combined`,
+  });
+
+// Existing posts are matched by id, or by postTypeId + slug
+export const upsertPostItemSchema = updatePostSchema
+  .omit({ autoSave: true, relationships: true })
+  .extend({
+    id: z.string().optional(),
+    postTypeId: z.string().optional(),
+  })
+  .refine((val) => !!val.id || (!!val.postTypeId && !!val.slug), {
+    message: 'Each item needs an id, or a postTypeId and slug',
+  });
+
+export const batchUpsertPostsSchema = z.object({
+  items: z.array(upsertPostItemSchema).min(1).max(MAX_POST_BATCH_SIZE),
+});
+
 export type CreatePostInput = z.infer<typeof createPostSchema>;
 export type UpdatePostInput = z.infer<typeof updatePostSchema>;
+export type BatchGetPostsInput = z.infer<typeof batchGetPostsSchema>;
+export type UpsertPostItemInput = z.infer<typeof upsertPostItemSchema>;
@@ -4,8 +4,11 @@ import { authMiddleware, getAuthContext } from '../../lib/api/hono-middleware';
 import { Errors } from '../../lib/api/hono-response';
 import { typeDefs } from '../../lib/graphql/schema';
 import { resolvers, type GraphQLContext } from '../../lib/graphql/resolvers';
+import { createLoaders } from '../../lib/graphql/loaders';
+import { getCompiledQuery, type PersistedQueryExtension } from '../../lib/graphql/persisted-queries';
+import { checkQueryComplexity } from '../../lib/graphql/complexity';
 import { makeExecutableSchema } from '@graphql-tools/schema';
-import { graphql } from 'graphql';
+import { execute } from 'graphql';
 
 const app = new Hono<{ Bindings: CloudflareBindings }>();
 
@@ -21,11 +24,45 @@ app.post(
     try {
       const { db, user, organizationId } = getAuthContext(c);
       
-      const body = await c.req.json() as { query?: string; variables?: Record<string, unknown>; operationName?: string };
-      const { query, variables, operationName } = body;
+      const body = await c.req.json() as {
+        query?: string;
+        variables?: Record<string, unknown>;
+        operationName?: string;
+        extensions?: { persistedQuery?: PersistedQueryExtension };
+      };
+      const { query, variables, operationName, extensions } = body;
+
+      // Parse + validate once per distinct query; persisted queries may send only the hash
+      const compiled = await getCompiledQuery(schema, query, extensions?.persistedQuery);
+      if (!compiled.ok) {
+        if (compiled.code === 'BAD_REQUEST') {
+          return c.json(Errors.badRequest(compiled.messages[0]), 400);
+        }
+        // Apollo clients expect PersistedQueryNotFound with a 200 so they retry with the full query
+        const status = compiled.code === 'PERSISTED_QUERY_NOT_FOUND' ? 200 : 400;
+        return c.json(
+          {
+            errors: compiled.messages.map((message) => ({
+              message,
+              extensions: { code: compiled.code },
+            })),
+          },
+          status
+        );
+      }
 
-      if (!query) {
-        return c.json(Errors.badRequest('GraphQL query is required'), 400);
+      // Reject overly deep or expensive queries before any resolver touches D1
+      const complexityError = checkQueryComplexity(
+        schema,
+        compiled.document,
+        operationName,
+        variables
+      );
+      if (complexityError) {
+        return c.json(
+          { errors: [{ message: complexityError, extensions: { code: 'QUERY_TOO_COMPLEX' } }] },
+          400
+        );
       }
 
       // Extract organizationId from variables if provided, or use from context
@@ -33,6 +70,7 @@ app.post(
 
       const context: GraphQLContext = {
         db,
+        loaders: createLoaders(db),
         user: {
           id: user.id,
           email: user.email,
@@ -40,9 +78,9 @@ app.post(
         organizationId: orgId,
       };
 
-      const result = await graphql({
+      const result = await execute({
         schema,
-        source: query,
+        document: compiled.document,
         variableValues: variables || undefined,
         operationName: operationName || undefined,
         contextValue: context,
@@ -7,6 +7,7 @@ import { z } from 'zod';
 import { media } from '../../db/schema';
 import { deleteFileFromR2 } from '../../lib/storage/upload';
 import { getMediaVariantUrls } from '../../lib/media/urls';
+import { invalidateMediaCache } from '../../lib/cache/invalidation';
 
 const app = new Hono<{ Bindings: CloudflareBindings }>();
 
@@ -124,6 +125,9 @@ app.delete(
       // Continue with DB deletion even if R2 deletion fails
     }
 
+    // Drop the file from this data center's cache (other colos keep their copy until evicted)
+    await invalidateMediaCache(file.fileKey, c.env.APP_URL);
+
     // Delete from database
     await db
       .delete(media)
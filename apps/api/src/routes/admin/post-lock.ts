@@ -4,6 +4,7 @@ import { nanoid } from 'nanoid';
 import type { CloudflareBindings } from '../../types';
 import { authMiddleware, orgAccessMiddleware, permissionMiddleware, getAuthContext } from '../../lib/api/hono-middleware';
 import { successResponse, Errors } from '../../lib/api/hono-response';
+import { forwardToPostCollaboration } from '../../lib/collaboration/collaboration-client';
 import { posts, postEditLocks, users } from '../../db/schema';
 
 const app = new Hono<{ Bindings: CloudflareBindings }>();
@@ -19,6 +20,12 @@ app.get(
     const { db, user, organizationId } = getAuthContext(c);
     const postId = c.req.param('postId');
 
+    // Served by the post's Durable Object when configured, otherwise fall back to D1
+    const forwarded = await forwardToPostCollaboration(c, postId, '/lock');
+    if (forwarded) {
+      return forwarded;
+    }
+
     // Verify post exists and belongs to organization
     const post = await db.query.posts.findFirst({
       where: (p, { eq, and: andFn }) => andFn(
@@ -84,6 +91,12 @@ app.post(
     const { db, user, organizationId } = getAuthContext(c);
     const postId = c.req.param('postId');
 
+    // Served by the post's Durable Object when configured, otherwise fall back to D1
+    const forwarded = await forwardToPostCollaboration(c, postId, '/lock');
+    if (forwarded) {
+      return forwarded;
+    }
+
     // Verify post exists and belongs to organization
     const post = await db.query.posts.findFirst({
       where: (p, { eq, and: andFn }) => andFn(
@@ -181,6 +194,12 @@ app.delete(
     const { db, user, organizationId } = getAuthContext(c);
     const postId = c.req.param('postId');
 
+    // Served by the post's Durable Object when configured, otherwise fall back to D1
+    const forwarded = await forwardToPostCollaboration(c, postId, '/lock');
+    if (forwarded) {
+      return forwarded;
+    }
+
     // Find active lock
     const now = new Date();
     const lock = await db.query.postEditLocks.findFirst({
@@ -218,6 +237,12 @@ app.post(
     const { db, user, organizationId } = getAuthContext(c);
     const postId = c.req.param('postId');
 
+    // Served by the post's Durable Object when configured, otherwise fall back to D1
+    const forwarded = await forwardToPostCollaboration(c, postId, '/lock/takeover');
+    if (forwarded) {
+      return forwarded;
+    }
+
     // Verify post exists and belongs to organization
     const post = await db.query.posts.findFirst({
       where: (p, { eq, and: andFn }) => andFn(
@@ -1,9 +1,10 @@
-import { Hono } from 'hono';
+import { Hono, type Context, type Next } from 'hono';
 import { eq, and, gt, desc } from 'drizzle-orm';
 import { nanoid } from 'nanoid';
 import type { CloudflareBindings } from '../../types';
 import { authMiddleware, orgAccessMiddleware, permissionMiddleware, getAuthContext } from '../../lib/api/hono-middleware';
 import { successResponse, Errors } from '../../lib/api/hono-response';
+import { forwardToPostCollaboration } from '../../lib/collaboration/collaboration-client';
 import { posts, presence, users } from '../../db/schema';
 
 const app = new Hono<{ Bindings: CloudflareBindings }>();
@@ -19,6 +20,12 @@ app.post(
     const { db, user, organizationId } = getAuthContext(c);
     const postId = c.req.param('postId');
 
+    // Served by the post's Durable Object when configured, otherwise fall back to D1
+    const forwarded = await forwardToPostCollaboration(c, postId, '/presence');
+    if (forwarded) {
+      return forwarded;
+    }
+
     // Verify post exists and belongs to organization
     const post = await db.query.posts.findFirst({
       where: (p, { eq, and: andFn }) => andFn(
@@ -89,6 +96,12 @@ app.get(
     const { db, organizationId } = getAuthContext(c);
     const postId = c.req.param('postId');
 
+    // Served by the post's Durable Object when configured, otherwise fall back to D1
+    const forwarded = await forwardToPostCollaboration(c, postId, '/presence');
+    if (forwarded) {
+      return forwarded;
+    }
+
     // Verify post exists and belongs to organization
     const post = await db.query.posts.findFirst({
       where: (p, { eq, and: andFn }) => andFn(
@@ -109,33 +122,66 @@ app.get(
         gtFn(pr.lastSeenAt, twoMinutesAgo)
       ),
       orderBy: [desc(presence.lastSeenAt)],
-    });
-    
-    // Get user info for each presence record
-    const activeUsers = await Promise.all(
-      activePresence.map(async (p) => {
-        const userInfo = await db.query.users.findFirst({
-          where: (u, { eq }) => eq(u.id, p.userId),
+      // Resolve users in the same statement rather than one lookup per row
+      with: {
+        user: {
           columns: {
             id: true,
             name: true,
             email: true,
             avatarUrl: true,
           },
-        });
-        return {
-          id: userInfo?.id || p.userId,
-          name: userInfo?.name,
-          email: userInfo?.email,
-          avatarUrl: userInfo?.avatarUrl,
-          lastSeenAt: p.lastSeenAt,
-        };
-      })
-    );
+        },
+      },
+    });
+
+    const activeUsers = activePresence.map((p) => ({
+      id: p.user?.id || p.userId,
+      name: p.user?.name,
+      email: p.user?.email,
+      avatarUrl: p.user?.avatarUrl,
+      lastSeenAt: p.lastSeenAt,
+    }));
 
     return c.json(successResponse({ activeUsers }));
   }
 );
 
+// Browsers can't set Authorization on WebSocket handshakes, so OTP sessions
+// pass their token as ?token= instead
+async function websocketTokenMiddleware(c: Context, next: Next) {
+  const token = c.req.query('token');
+  if (token && !c.req.header('Authorization')) {
+    const headers = new Headers(c.req.raw.headers);
+    headers.set('Authorization', `Bearer ${token}`);
+    c.req.raw = new Request(c.req.raw, { headers });
+  }
+  await next();
+}
+
+// GET /api/admin/v1/organizations/:orgId/posts/:postId/collaboration
+// WebSocket that pushes presence and lock changes for a post
+app.get(
+  '/:orgId/posts/:postId/collaboration',
+  websocketTokenMiddleware,
+  authMiddleware,
+  orgAccessMiddleware,
+  permissionMiddleware('posts:read'),
+  async (c) => {
+    const postId = c.req.param('postId');
+
+    if (c.req.header('Upgrade')?.toLowerCase() !== 'websocket') {
+      return c.json(Errors.badRequest('Expected WebSocket upgrade'), 426);
+    }
+
+    const forwarded = await forwardToPostCollaboration(c, postId, '/connect');
+    if (!forwarded) {
+      // No Durable Object binding - clients should use the heartbeat endpoints
+      return c.json(Errors.badRequest('Real-time collaboration is not configured'), 501);
+    }
+    return forwarded;
+  }
+);
+
 export default app;
 
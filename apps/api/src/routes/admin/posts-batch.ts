@@ -0,0 +1,126 @@
+import { Hono } from 'hono';
+import type { CloudflareBindings } from '../../types';
+import { authMiddleware, orgAccessMiddleware, permissionMiddleware, getAuthContext } from '../../lib/api/hono-admin-middleware';
+import { successResponse, Errors } from '../../lib/api/hono-response';
+import { batchGetPostsSchema, batchUpsertPostsSchema } from '../../lib/validations/post';
+import { batchGetPosts, batchUpsertPosts } from '../../lib/batch/post-batch-manager';
+import { invalidatePostsCache } from '../../lib/cache/invalidation';
+import { dispatchWebhook } from '../../lib/webhooks/webhook-dispatcher';
+
+const app = new Hono<{ Bindings: CloudflareBindings }>();
+
+// Routes use a regex param because a literal "posts:batchGet" segment would be
+// parsed as "posts" followed by a ":batchGet" path parameter
+
+// POST /api/admin/v1/organizations/:orgId/posts:batchGet
+// Fetch up to 100 posts (by id or slug) with field values and taxonomies
+app.post(
+  '/:orgId/:action{posts:batchGet}',
+  authMiddleware,
+  orgAccessMiddleware,
+  permissionMiddleware('posts:read'),
+  async (c) => {
+    const { db, organizationId } = getAuthContext(c);
+
+    let input;
+    try {
+      const body = await c.req.json();
+      input = batchGetPostsSchema.parse(body);
+    } catch (error) {
+      if (error && typeof error === 'object' && 'issues' in error) {
+        return c.json(Errors.validationError((error as any).issues), 400);
+      }
+      return c.json(Errors.badRequest('Invalid request body'), 400);
+    }
+
+    try {
+      const results = await batchGetPosts(db, organizationId!, input);
+      return c.json(successResponse({
+        results,
+        found: results.filter((result) => result.found).length,
+        missing: results.filter((result) => !result.found).length,
+      }));
+    } catch (error) {
+      console.error('Error in posts batchGet:', error);
+      return c.json(Errors.serverError(
+        error instanceof Error ? error.message : 'Failed to fetch posts'
+      ), 500);
+    }
+  }
+);
+
+// POST /api/admin/v1/organizations/:orgId/posts:batchUpsert
+// Create or update up to 100 posts in one D1 batch
+app.post(
+  '/:orgId/:action{posts:batchUpsert}',
+  authMiddleware,
+  orgAccessMiddleware,
+  permissionMiddleware('posts:create'),
+  permissionMiddleware('posts:update'),
+  async (c) => {
+    const { db, user, organizationId, apiKey } = getAuthContext(c);
+
+    let input;
+    try {
+      const body = await c.req.json();
+      input = batchUpsertPostsSchema.parse(body);
+    } catch (error) {
+      if (error && typeof error === 'object' && 'issues' in error) {
+        return c.json(Errors.validationError((error as any).issues), 400);
+      }
+      return c.json(Errors.badRequest('Invalid request body'), 400);
+    }
+
+    // Same author resolution as single post creation
+    const authorId = apiKey ? 'system-user-api' : user?.id;
+    if (!authorId) {
+      return c.json(Errors.unauthorized(), 401);
+    }
+
+    try {
+      const { results, created, updated } = await batchUpsertPosts(db, organizationId!, authorId, input.items);
+      const changed = [...created, ...updated];
+
+      if (changed.length > 0) {
+        // One cache purge and one webhook event for the whole batch
+        try {
+          await invalidatePostsCache(
+            organizationId!,
+            changed.flatMap((post) => [post.id, post.slug]),
+            db,
+            c.env.APP_URL
+          );
+        } catch (error) {
+          console.warn('Failed to invalidate cache:', error);
+        }
+
+        try {
+          await dispatchWebhook(db, organizationId!, {
+            event: 'post.batch_upserted',
+            data: {
+              createdIds: created.map((post) => post.id),
+              updatedIds: updated.map((post) => post.id),
+            },
+            timestamp: new Date().toISOString(),
+          });
+        } catch (error) {
+          console.warn('Failed to dispatch webhook:', error);
+        }
+      }
+
+      return c.json(successResponse({
+        results,
+        created: created.length,
+        updated: updated.length,
+        failed: results.filter((result) => result.status === 'error').length,
+      }));
+    } catch (error) {
+      console.error('Error in posts batchUpsert:', error);
+      return c.json(Errors.serverError(
+        error instanceof Error ? error.message : 'Failed to upsert posts'
+      ), 500);
+    }
+  }
+);
+
+export default app;
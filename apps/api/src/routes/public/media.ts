@@ -1,5 +1,11 @@
-import { Hono } from 'hono';
+import { Hono, type Context } from 'hono';
 import type { CloudflareBindings } from '../../types';
+import {
+  parseRangeHeader,
+  isIfRangeSatisfied,
+  formatContentRange,
+  type ByteRange,
+} from '../../lib/media/range';
 
 const app = new Hono<{ Bindings: CloudflareBindings }>();
 
@@ -71,15 +77,91 @@ function isImageFile(fileKey: string, contentType?: string): boolean {
   return imageExtensions.some(ext => extension.endsWith(ext));
 }
 
+// Objects larger than this are streamed straight from R2 and never stored in the
+// Cache API (Cloudflare rejects cache entries above 512 MB)
+const CACHE_MAX_OBJECT_SIZE = 512 * 1024 * 1024;
+// A range miss only triggers a background full read (to fill the cache) for
+// objects up to this size, so it finishes well within waitUntil
+const CACHE_BACKFILL_MAX_SIZE = 25 * 1024 * 1024;
+
+// Cache keys with a backfill running in this isolate, so a player firing many
+// range requests at once starts at most one full read per file
+const backfillsInFlight = new Set<string>();
+
+/**
+ * Build the Cache API key for a media request.
+ * Only the `variant` query parameter affects the response, so everything else is
+ * dropped to stop arbitrary query strings from fragmenting the cache.
+ */
+function getMediaCacheKey(requestUrl: string, variant?: string): Request {
+  const url = new URL(requestUrl);
+  url.search = '';
+  if (variant && VARIANT_CONFIG[variant]) {
+    url.searchParams.set('variant', variant);
+  }
+  return new Request(url.toString(), { method: 'GET' });
+}
+
+/**
+ * Get the default Cache API instance when running on Workers.
+ *
+ * The Cache API only stores anything on a custom domain (zone); on *.workers.dev
+ * put() is a no-op, so caching is skipped there rather than paying for reads
+ * that will never be served from cache.
+ */
+function getMediaCache(requestUrl: string): Cache | null {
+  if (typeof caches === 'undefined') {
+    return null;
+  }
+  if (new URL(requestUrl).hostname.endsWith('.workers.dev')) {
+    return null;
+  }
+  return (caches as unknown as { default: Cache }).default ?? null;
+}
+
 /**
- * Fetch file from R2
- * Note: Cloudflare's edge cache will handle caching automatically based on Cache-Control headers
+ * Run a promise after the response is sent, logging (not throwing) failures
  */
-async function fetchFromR2(
+function runInBackground(c: Context, promise: Promise<unknown>, label: string): void {
+  const settled = promise.catch((error) => {
+    console.error(`${label}:`, error);
+  });
+  try {
+    c.executionCtx.waitUntil(settled);
+  } catch {
+    // No execution context (e.g. tests) - let the promise settle on its own
+  }
+}
+
+/**
+ * Read the whole object from R2 and store it in the Cache API.
+ * Used when the first request for a file is a range request, so the cache
+ * still gets populated and later seeks are answered by cache.match().
+ * At most one backfill per cache key runs at a time in this isolate.
+ */
+async function fillMediaCache(
   bucket: R2Bucket,
-  fileKey: string
-): Promise<R2ObjectBody | null> {
-  return await bucket.get(fileKey);
+  cache: Cache,
+  cacheKey: Request,
+  fileKey: string,
+  headers: Record<string, string>
+): Promise<void> {
+  if (backfillsInFlight.has(cacheKey.url)) {
+    return;
+  }
+  backfillsInFlight.add(cacheKey.url);
+  try {
+    const object = await bucket.get(fileKey);
+    if (!object) {
+      return;
+    }
+    await cache.put(cacheKey, new Response(object.body, {
+      status: 200,
+      headers: { ...headers, 'Content-Length': object.size.toString() },
+    }));
+  } finally {
+    backfillsInFlight.delete(cacheKey.url);
+  }
 }
 
 // GET /api/public/v1/media/:fileKey - Serve media file from R2
@@ -104,10 +186,33 @@ app.get('/media/:fileKey', async (c) => {
     return c.json({ error: 'R2 bucket not configured' }, 500);
   }
 
+  const rangeHeader = c.req.header('Range');
+  const ifRangeHeader = c.req.header('If-Range');
+
+  // Serve hot assets from the Cache API so they skip R2 entirely.
+  // cache.match() evaluates Range, If-None-Match and If-Modified-Since itself,
+  // returning 206/304 from the cached full response as appropriate.
+  const cache = getMediaCache(c.req.url);
+  const cacheKey = getMediaCacheKey(c.req.url, variant);
+  if (cache) {
+    try {
+      const cached = await cache.match(
+        new Request(cacheKey.url, { method: 'GET', headers: c.req.raw.headers })
+      );
+      if (cached) {
+        return cached;
+      }
+    } catch (error) {
+      console.error('Media cache lookup failed:', error);
+      // Fall through to R2
+    }
+  }
+
   try {
     // Determine which file to fetch (variant or original)
     let targetFileKey = fileKey;
     let useVariant = false;
+    let head: R2Object | null = null;
 
     if (variant && VARIANT_CONFIG[variant]) {
       const variantFileKey = getVariantFileKey(fileKey, variant);
@@ -116,6 +221,7 @@ app.get('/media/:fileKey', async (c) => {
       if (variantObject) {
         targetFileKey = variantFileKey;
         useVariant = true;
+        head = variantObject;
       } else {
         // Variant doesn't exist, check if original is an image
         // If it's an image, we'll serve the original (variants can be generated later)
@@ -128,11 +234,38 @@ app.get('/media/:fileKey', async (c) => {
             return c.json({ error: 'Variants are only supported for images' }, 400);
           }
         }
+        head = originalObject;
       }
     }
 
-    // Fetch file from R2
-    const object = await fetchFromR2(bucket, targetFileKey);
+    // Range requests need the object size (and validators for If-Range)
+    // before the read, so resolve metadata with a HEAD if we don't have it yet
+    if (rangeHeader && !head) {
+      head = await bucket.head(targetFileKey);
+      if (!head) {
+        return c.json({ error: 'File not found' }, 404);
+      }
+    }
+
+    let range: ByteRange | null = null;
+    if (rangeHeader && head && isIfRangeSatisfied(ifRangeHeader, head)) {
+      const parsed = parseRangeHeader(rangeHeader, head.size);
+      if (parsed.type === 'multiple' || parsed.type === 'unsatisfiable') {
+        return c.body(null, 416, {
+          'Content-Range': formatContentRange(null, head.size),
+          'Accept-Ranges': 'bytes',
+        });
+      }
+      if (parsed.type === 'range') {
+        range = parsed.range;
+      }
+    }
+
+    // Fetch file from R2 - only the requested bytes for range requests
+    const object = await bucket.get(
+      targetFileKey,
+      range ? { range: { offset: range.start, length: range.end - range.start + 1 } } : undefined
+    );
 
     if (!object) {
       return c.json({ error: 'File not found' }, 404);
@@ -148,6 +281,7 @@ app.get('/media/:fileKey', async (c) => {
       // Long-term caching: 1 year (31536000 seconds) with immutable flag
       // This tells Cloudflare and browsers to cache aggressively
       'Cache-Control': 'public, max-age=31536000, immutable',
+      'Accept-Ranges': 'bytes',
     };
 
     // Add ETag if available (for cache validation and conditional requests)
@@ -180,19 +314,44 @@ app.get('/media/:fileKey', async (c) => {
       }
     }
 
+    // Add Vary header if serving variants (helps with cache key generation)
+    if (useVariant) {
+      headers['Vary'] = 'Accept';
+    }
+
+    if (range) {
+      // Browsers open video and PDFs with `bytes=0-`, so without a backfill these
+      // files would never be cached. Only that opening request triggers it (not
+      // every seek), and only for objects small enough to read in the background.
+      if (cache && range.start === 0 && object.size <= CACHE_BACKFILL_MAX_SIZE) {
+        runInBackground(
+          c,
+          fillMediaCache(bucket, cache, cacheKey, targetFileKey, { ...headers }),
+          'Failed to cache media file'
+        );
+      }
+
+      headers['Content-Range'] = formatContentRange(range, object.size);
+      headers['Content-Length'] = (range.end - range.start + 1).toString();
+      // Stream only the requested slice
+      return c.body(object.body, 206, headers);
+    }
+
     // Add content length if available
     if (object.size) {
       headers['Content-Length'] = object.size.toString();
     }
 
-    // Add Vary header if serving variants (helps with cache key generation)
-    if (useVariant) {
-      headers['Vary'] = 'Accept';
+    // Stream the file content without buffering it in the Worker
+    const response = new Response(object.body, { status: 200, headers });
+
+    // Populate the Cache API in the background so later requests (including
+    // range requests) are served without touching R2
+    if (cache && object.size <= CACHE_MAX_OBJECT_SIZE) {
+      runInBackground(c, cache.put(cacheKey, response.clone()), 'Failed to cache media file');
     }
 
-    // Stream the file content
-    // Cloudflare Workers will automatically cache this response based on Cache-Control headers
-    return c.body(object.body, 200, headers);
+    return response;
   } catch (error) {
     console.error('Error serving media file:', error);
     return c.json(
@@ -203,4 +362,3 @@ app.get('/media/:fileKey', async (c) => {
 });
 
 export default app;
-
@@ -2,6 +2,8 @@
 export interface CloudflareBindings {
   DB: D1Database;
   R2_BUCKET: R2Bucket;
+  // Per-post presence and edit locks (optional - routes fall back to D1 without it)
+  POST_COLLABORATION?: DurableObjectNamespace;
   // Environment variables and secrets configured in Cloudflare Workers
   R2_ACCOUNT_ID?: string;
   R2_ACCESS_KEY_ID?: string;
@@ -15,6 +17,10 @@ export interface CloudflareBindings {
   RESEND_API_KEY?: string;
   EMAIL_FROM?: string;
   EMAIL_FROM_NAME?: string;
+  // Requests slower than this (ms) are logged as [SLOW_REQUEST] traces (default 1000)
+  SLOW_REQUEST_MS?: string;
+  // Fraction of slow requests to log, 0-1 (default 1)
+  SLOW_REQUEST_SAMPLE_RATE?: string;
 }
 
 // Hono context variables
@@ -28,5 +34,6 @@ export interface HonoVariables {
     scopes: string[];
   };
   authMethod?: 'cloudflare-access' | 'api-key';
+  metrics?: import('./lib/api/server-timing').RequestMetrics;
 }
 
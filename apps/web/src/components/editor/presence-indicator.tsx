@@ -27,6 +27,7 @@ export function PresenceIndicator({ postId, className = '' }: PresenceIndicatorP
       getPresence: async (id: string) => {
         return (await api.getPostPresence?.(id)) as { activeUsers: Array<unknown> };
       },
+      getCollaborationUrl: api.getPostCollaborationUrl,
     },
   });
 
@@ -584,6 +584,22 @@ class ApiClient {
     return this.request(`/api/admin/v1/organizations/${orgId}/posts/${postId}/presence`);
   }
 
+  /**
+   * WebSocket URL for real-time presence and lock updates.
+   * The session token goes in the query string since browsers can't set headers on WebSockets.
+   */
+  getPostCollaborationUrl(orgId: string, postId: string): string {
+    const wsBase = this.getBaseUrl().replace(/^http/, 'ws');
+    const url = new URL(`${wsBase}/api/admin/v1/organizations/${orgId}/posts/${postId}/collaboration`);
+    if (typeof window !== 'undefined') {
+      const sessionToken = localStorage.getItem('omni-cms:session-token');
+      if (sessionToken) {
+        url.searchParams.set('token', sessionToken);
+      }
+    }
+    return url.toString();
+  }
+
   // Content Blocks
   async getContentBlocks(orgId: string, params?: Record<string, string>) {
     const query = params ? `?${new URLSearchParams(params)}` : '';
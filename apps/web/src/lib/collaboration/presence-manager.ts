@@ -14,12 +14,15 @@ interface PresenceManagerOptions {
   api: {
     updatePresence?: (postId: string) => Promise<void>;
     getPresence?: (postId: string) => Promise<{ activeUsers: Array<unknown> }>;
+    // When provided, presence is pushed over WebSocket and HTTP polling is only a fallback
+    getCollaborationUrl?: (postId: string) => string;
   };
 }
 
 /**
  * Manages user presence for collaborative editing
- * Sends periodic heartbeats and fetches active users
+ * Uses the collaboration WebSocket when available; otherwise sends periodic
+ * heartbeats and polls for active users
  * 
  * Note: This provides presence tracking only (who's viewing).
  * Real-time collaborative editing (Y.js/CRDT) is not yet implemented.
@@ -38,6 +41,12 @@ export function usePresenceManager({
   const retryCountRef = useRef<number>(0);
   const updatePresenceWithRetryRef = useRef<((postId: string, retries?: number) => Promise<void>) | null>(null);
   const [connectionStatus, setConnectionStatus] = useState<ConnectionStatus>('disconnected');
+  const [socketConnected, setSocketConnected] = useState(false);
+  // Refs keep the WebSocket effect from reconnecting when callers pass new objects each render
+  const apiRef = useRef(api);
+  apiRef.current = api;
+  const onActiveUsersChangeRef = useRef(onActiveUsersChange);
+  onActiveUsersChangeRef.current = onActiveUsersChange;
 
   const updateConnectionStatus = useCallback((status: ConnectionStatus) => {
     setConnectionStatus(status);
@@ -97,12 +106,74 @@ export function usePresenceManager({
     }
   }, [api, postId, onActiveUsersChange, connectionStatus, updateConnectionStatus]);
 
+  // Real-time presence over WebSocket; server pushes changes so no polling is needed
+  useEffect(() => {
+    const getCollaborationUrl = apiRef.current.getCollaborationUrl;
+    if (!postId || !enabled || !getCollaborationUrl || typeof WebSocket === 'undefined') {
+      return;
+    }
+
+    let socket: WebSocket;
+    try {
+      socket = new WebSocket(getCollaborationUrl(postId));
+    } catch (error) {
+      console.error('Failed to open collaboration socket:', error);
+      return;
+    }
+
+    let socketHeartbeat: NodeJS.Timeout | null = null;
+
+    socket.onopen = () => {
+      setSocketConnected(true);
+      socketHeartbeat = setInterval(() => {
+        if (socket.readyState === WebSocket.OPEN) {
+          socket.send(JSON.stringify({ type: 'heartbeat' }));
+        }
+      }, heartbeatInterval);
+    };
+
+    socket.onmessage = (event) => {
+      try {
+        const message = JSON.parse(event.data as string) as { activeUsers?: Array<unknown> };
+        if (message.activeUsers) {
+          onActiveUsersChangeRef.current?.(
+            message.activeUsers as Array<{ id: string; name: string; avatarUrl?: string | null }>
+          );
+        }
+      } catch {
+        // Ignore malformed messages
+      }
+    };
+
+    socket.onclose = () => {
+      // Fall back to heartbeat polling
+      setSocketConnected(false);
+      if (socketHeartbeat) {
+        clearInterval(socketHeartbeat);
+        socketHeartbeat = null;
+      }
+    };
+
+    return () => {
+      if (socketHeartbeat) {
+        clearInterval(socketHeartbeat);
+      }
+      socket.onclose = null;
+      socket.close();
+      setSocketConnected(false);
+    };
+  }, [postId, enabled, heartbeatInterval]);
+
   useEffect(() => {
     if (!postId || !enabled || !api.updatePresence || !api.getPresence) {
       updateConnectionStatus('disconnected');
       return;
     }
 
+    if (socketConnected) {
+      return;
+    }
+
     updateConnectionStatus('connecting');
 
     // Initial presence update
@@ -128,7 +199,14 @@ export function usePresenceManager({
       }
       updateConnectionStatus('disconnected');
     };
-  }, [postId, enabled, heartbeatInterval, pollInterval, api, updatePresenceWithRetry, pollActiveUsers, updateConnectionStatus]);
+  }, [postId, enabled, heartbeatInterval, pollInterval, api, updatePresenceWithRetry, pollActiveUsers, updateConnectionStatus, socketConnected]);
+
+  // Runs after the polling effect's cleanup so the socket's status wins
+  useEffect(() => {
+    if (socketConnected) {
+      updateConnectionStatus('connected');
+    }
+  }, [socketConnected, updateConnectionStatus]);
 
   return {
     connectionStatus,
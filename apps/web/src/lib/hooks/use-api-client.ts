@@ -113,6 +113,7 @@ export function useApiClient() {
       // Presence
       updatePostPresence: (postId: string) => apiClient.updatePostPresence(orgId, postId),
       getPostPresence: (postId: string) => apiClient.getPostPresence(orgId, postId),
+      getPostCollaborationUrl: (postId: string) => apiClient.getPostCollaborationUrl(orgId, postId),
       // Content Blocks
       getContentBlocks: (params?: Record<string, string>) => apiClient.getContentBlocks(orgId, params),
       getContentBlock: (blockId: string) => apiClient.getContentBlock(orgId, blockId),
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+API contract and payload-size regression harness for Study in Kazakhstan
+
+`check` records response fixtures offline - the API test suite runs the Worker
+app in-process against an in-memory Miniflare D1 loaded with a deterministic
+seed (apps/api/src/__tests__/integration/api-contract.test.ts) - and compares
+them against the committed baseline:
+
+  - response shape (keys and value types, per endpoint)
+  - response size in bytes (and bytes per item for list endpoints)
+  - D1 query count reported via X-DB-Query-Count / Server-Timing
+
+Usage:
+    python scripts/api-contract.py check             # record from the seed, diff vs baseline
+    python scripts/api-contract.py update-baseline   # record from the seed, accept as the baseline
+    python scripts/api-contract.py record            # fetch fixtures from a running local API
+
+`check` exits with status 1 when a shape changes, a list payload grows past
+--max-growth (default 10%), or an endpoint issues more queries than before.
+When no baseline exists it writes one from the seed, unless --ci is given.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from server_timing import timing_from_headers
+
+API_BASE = os.environ.get("API_BASE", "http://127.0.0.1:8787")
+API_KEY = os.environ.get("API_KEY")
+ORG_SLUG = os.environ.get("ORG_SLUG", "study-in-kazakhstan")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CONTRACT_DIR = REPO_ROOT / "docs/api/study-in-kazakhstan/contract"
+FIXTURES_DIR = CONTRACT_DIR / "fixtures"
+BASELINE_FILE = CONTRACT_DIR / "baseline.json"
+# Same endpoints the website uses (see test-api-endpoints.py); shared with the
+# seed-based recorder in the API test suite. Paths contain an {orgSlug} placeholder.
+ENDPOINTS_FILE = CONTRACT_DIR / "endpoints.json"
+
+DEFAULT_MAX_GROWTH = 0.10
+
+
+# ---------------------------------------------------------------------------
+# Shape extraction
+# ---------------------------------------------------------------------------
+
+def _type_name(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+def extract_shape(value, path="$", shape=None):
+    """
+    Flatten a JSON value into {path: sorted list of types}.
+    Array elements share one path (`$.data[]`) so the shape does not depend
+    on how many items were returned.
+    """
+    if shape is None:
+        shape = {}
+    types = shape.setdefault(path, [])
+    type_name = _type_name(value)
+    if type_name not in types:
+        types.append(type_name)
+        types.sort()
+
+    if isinstance(value, dict):
+        for key, child in value.items():
+            extract_shape(child, f"{path}.{key}", shape)
+    elif isinstance(value, list):
+        for child in value:
+            extract_shape(child, f"{path}[]", shape)
+    return shape
+
+
+def diff_shapes(baseline, current):
+    """Return a list of human-readable shape differences"""
+    changes = []
+    for path in sorted(set(baseline) | set(current)):
+        if path not in current:
+            changes.append(f"removed {path} ({'|'.join(baseline[path])})")
+        elif path not in baseline:
+            changes.append(f"added {path} ({'|'.join(current[path])})")
+        elif baseline[path] != current[path]:
+            # A nullable field seen as null in one run is not a contract change
+            base_types = set(baseline[path]) - {"null"}
+            current_types = set(current[path]) - {"null"}
+            if base_types and current_types and base_types != current_types:
+                changes.append(
+                    f"type of {path}: {'|'.join(baseline[path])} -> {'|'.join(current[path])}"
+                )
+    return changes
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def fixture_path(name):
+    return FIXTURES_DIR / f"{name}.json"
+
+
+def load_json(filepath):
+    with open(filepath, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(filepath, data):
+    """Save data to JSON file"""
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+
+def summarize_fixture(fixture):
+    """Reduce a recorded fixture to the metrics stored in the baseline"""
+    body = fixture["body"]
+    data = body.get("data") if isinstance(body, dict) else None
+    items = len(data) if isinstance(data, list) else None
+    timing = fixture.get("timing") or {}
+
+    return {
+        "path": fixture["path"],
+        "status": fixture["status"],
+        "bytes": fixture["bytes"],
+        "items": items,
+        "bytes_per_item": round(fixture["bytes"] / items) if items else None,
+        "db_queries": timing.get("db_queries"),
+        "shape": extract_shape(body),
+    }
+
+
+def load_endpoints():
+    """Return [(name, path)] from endpoints.json"""
+    return [(endpoint["name"], endpoint["path"]) for endpoint in load_json(ENDPOINTS_FILE)]
+
+
+def load_summaries():
+    summaries = {}
+    missing = []
+    for name, _ in load_endpoints():
+        filepath = fixture_path(name)
+        if filepath.exists():
+            summaries[name] = summarize_fixture(load_json(filepath))
+        else:
+            missing.append(name)
+    return summaries, missing
+
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+
+def record_from_seed():
+    """
+    Record fixtures offline via the API test suite (Miniflare D1 + seed).
+    Returns the recorder's exit status.
+    """
+    for name, _ in load_endpoints():
+        fixture_path(name).unlink(missing_ok=True)
+
+    print("🌱 Recording fixtures from the seeded in-process API\n")
+    env = {**os.environ, "API_CONTRACT_DIR": str(CONTRACT_DIR)}
+    try:
+        completed = subprocess.run(
+            ["pnpm", "--filter", "api", "run", "test:api-contract"],
+            cwd=REPO_ROOT,
+            env=env,
+        )
+    except FileNotFoundError:
+        print("❌ pnpm not found - install dependencies or pass --no-record to compare existing fixtures")
+        return 1
+    if completed.returncode != 0:
+        print("\n❌ Recording failed - see the Jest output above")
+    return completed.returncode
+
+
+def record(args):
+    # Only recording needs HTTP; check/update-baseline stay dependency-free
+    import requests
+
+    headers = {"Content-Type": "application/json"}
+    if API_KEY:
+        headers["Authorization"] = f"Bearer {API_KEY}"
+
+    print(f"🎥 Recording fixtures from {args.api_base}\n")
+    failed = 0
+    for name, path in load_endpoints():
+        url = f"{args.api_base}{path.replace('{orgSlug}', ORG_SLUG)}"
+        try:
+            response = requests.get(url, headers=headers, timeout=30)
+            body = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"❌ {name}: {e}")
+            failed += 1
+            continue
+
+        fixture = {
+            "name": name,
+            "path": path,
+            "status": response.status_code,
+            "bytes": len(response.content),
+            "timing": timing_from_headers(response.headers),
+            "body": body,
+        }
+        save_json(fixture_path(name), fixture)
+
+        queries = fixture["timing"]["db_queries"] if fixture["timing"] else "?"
+        print(f"✅ {name}: HTTP {response.status_code}, {fixture['bytes']} bytes, {queries} queries")
+
+    if failed:
+        print(f"\n❌ {failed} endpoint(s) could not be recorded - is the local API running?")
+        return 1
+    print(f"\n💾 Fixtures saved to {FIXTURES_DIR}")
+    return 0
+
+
+def update_baseline(args):
+    if not args.no_record and record_from_seed() != 0:
+        return 1
+
+    summaries, missing = load_summaries()
+    if missing:
+        print(f"❌ Missing fixtures: {', '.join(missing)}")
+        return 1
+
+    save_json(BASELINE_FILE, summaries)
+    print(f"💾 Baseline for {len(summaries)} endpoints saved to {BASELINE_FILE}")
+    return 0
+
+
+def _growth(baseline_value, current_value):
+    if not baseline_value or current_value is None:
+        return None
+    return (current_value - baseline_value) / baseline_value
+
+
+def compare_endpoint(baseline, current, max_growth):
+    """Return (failures, notes) for one endpoint"""
+    failures = []
+    notes = []
+
+    if baseline["status"] != current["status"]:
+        failures.append(f"status {baseline['status']} -> {current['status']}")
+
+    failures.extend(f"shape: {change}" for change in diff_shapes(baseline["shape"], current["shape"]))
+
+    size_growth = _growth(baseline["bytes"], current["bytes"])
+    size_note = f"{baseline['bytes']} -> {current['bytes']} bytes"
+    if size_growth is not None:
+        size_note += f" ({size_growth:+.1%})"
+
+    if baseline["items"] is not None:
+        # List endpoints: per-item size catches bloat (e.g. full `content` in
+        # lists) even if the seed data returns a different number of items
+        item_growth = _growth(baseline["bytes_per_item"], current["bytes_per_item"])
+        if item_growth is not None and item_growth > max_growth:
+            failures.append(
+                f"list payload grew {item_growth:+.1%} per item "
+                f"({baseline['bytes_per_item']} -> {current['bytes_per_item']} bytes/item)"
+            )
+        elif size_growth is not None and size_growth > max_growth and current["items"] == baseline["items"]:
+            failures.append(f"list payload grew {size_note}")
+        else:
+            notes.append(size_note)
+    else:
+        notes.append(size_note)
+
+    base_queries = baseline.get("db_queries")
+    current_queries = current.get("db_queries")
+    if base_queries is not None and current_queries is not None:
+        if current_queries > base_queries:
+            failures.append(f"D1 queries rose {base_queries} -> {current_queries}")
+        else:
+            notes.append(f"{current_queries} queries")
+    elif base_queries is not None:
+        failures.append("D1 query count no longer reported (missing Server-Timing header)")
+
+    return failures, notes
+
+
+def check(args):
+    if args.ci and not BASELINE_FILE.exists():
+        print(f"❌ No baseline at {BASELINE_FILE} - run update-baseline and commit it")
+        return 1
+
+    if not args.no_record and record_from_seed() != 0:
+        return 1
+
+    if not BASELINE_FILE.exists():
+        # First run: like a new Jest snapshot, the baseline is written and must be committed
+        print("📝 No baseline yet - writing one from the current fixtures")
+        status = update_baseline(argparse.Namespace(no_record=True))
+        if status == 0:
+            print(f"   Commit {BASELINE_FILE.relative_to(REPO_ROOT)}")
+        return status
+
+    baseline = load_json(BASELINE_FILE)
+    summaries, missing = load_summaries()
+
+    print(f"🔍 Checking {len(summaries)} fixtures against {BASELINE_FILE} (max growth {args.max_growth:.0%})\n")
+    failed = 0
+    for name, _ in load_endpoints():
+        if name in missing:
+            print(f"❌ {name}: fixture missing")
+            failed += 1
+            continue
+        if name not in baseline:
+            print(f"⚠️ {name}: not in baseline (run update-baseline to add it)")
+            continue
+
+        failures, notes = compare_endpoint(baseline[name], summaries[name], args.max_growth)
+        if failures:
+            failed += 1
+            print(f"❌ {name}")
+            for failure in failures:
+                print(f"    {failure}")
+        else:
+            print(f"✅ {name}: {', '.join(notes)}")
+
+    print()
+    if failed:
+        print(f"❌ {failed} endpoint(s) regressed. If the change is intended, run update-baseline.")
+        return 1
+    print("✅ All endpoints match the baseline")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API contract and payload-size regression harness")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    no_record_help = "compare the fixtures already on disk instead of recording from the seed"
+
+    check_parser = subparsers.add_parser("check", help="record from the seed and compare against the baseline")
+    check_parser.add_argument(
+        "--max-growth", type=float, default=DEFAULT_MAX_GROWTH,
+        help="allowed list payload growth as a fraction (default 0.10)",
+    )
+    check_parser.add_argument("--ci", action="store_true", help="fail instead of writing a missing baseline")
+    check_parser.add_argument("--no-record", action="store_true", help=no_record_help)
+    check_parser.set_defaults(func=check)
+
+    baseline_parser = subparsers.add_parser("update-baseline", help="record from the seed and store it as the baseline")
+    baseline_parser.add_argument("--no-record", action="store_true", help=no_record_help)
+    baseline_parser.set_defaults(func=update_baseline)
+
+    record_parser = subparsers.add_parser("record", help="record fixtures from a running local API")
+    record_parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default {API_BASE})")
+    record_parser.set_defaults(func=record)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ import requests
 import os
 from pathlib import Path
 
+from server_timing import timing_from_headers, aggregate_timings, print_timing_summary
+
 API_BASE = "https://omni-cms-api.joseph-9a2.workers.dev"
 API_KEY = "omni_099c139e8f5dce0edfc59cc9926d0cd7"
 ORG_SLUG = "study-in-kazakhstan"
@@ -29,12 +31,21 @@ def save_json(filename, data):
         json.dump(data, f, indent=2, ensure_ascii=False)
     print(f"💾 Saved to {filepath}")
 
+# (name, timing) per request, from the Server-Timing / X-DB-Query-Count headers
+timing_samples = []
+
+def get(name, url):
+    """GET an endpoint and record its Server-Timing metrics under `name`"""
+    response = requests.get(url, headers=headers)
+    timing_samples.append((name, timing_from_headers(response.headers)))
+    return response
+
 print("🔍 Querying API Schema...\n")
 
 # 1. Get organizations
 print("1. Getting organizations...")
 try:
-    response = requests.get(f"{API_BASE}/api/admin/v1/organizations", headers=headers)
+    response = get("organizations", f"{API_BASE}/api/admin/v1/organizations")
     orgs_data = response.json()
     if orgs_data.get('success') and orgs_data.get('data'):
         org = next((o for o in orgs_data['data'] if o.get('slug') == ORG_SLUG), None)
@@ -55,7 +66,7 @@ except Exception as e:
 if org_id:
     print("2. Getting full schema...")
     try:
-        response = requests.get(f"{API_BASE}/api/admin/v1/organizations/{org_id}/schema", headers=headers)
+        response = get("schema", f"{API_BASE}/api/admin/v1/organizations/{org_id}/schema")
         schema_data = response.json()
         if schema_data.get('success') and schema_data.get('data'):
             schema = schema_data['data']
@@ -87,7 +98,7 @@ if org_id:
 # 3. Get universities
 print("\n3. Getting universities from public API...")
 try:
-    response = requests.get(f"{API_BASE}/api/public/v1/{ORG_SLUG}/posts?post_type=universities&per_page=5", headers=headers)
+    response = get("universities-list", f"{API_BASE}/api/public/v1/{ORG_SLUG}/posts?post_type=universities&per_page=5")
     unis_data = response.json()
     if unis_data.get('success'):
         total = unis_data.get('meta', {}).get('total', 0)
@@ -105,7 +116,7 @@ except Exception as e:
 print("\n4. Searching for Coventry University...")
 coventry = None
 try:
-    response = requests.get(f"{API_BASE}/api/public/v1/{ORG_SLUG}/posts?post_type=universities&search=coventry&per_page=10", headers=headers)
+    response = get("universities-search", f"{API_BASE}/api/public/v1/{ORG_SLUG}/posts?post_type=universities&search=coventry&per_page=10")
     coventry_data = response.json()
     if coventry_data.get('success') and coventry_data.get('data'):
         coventry = next((u for u in coventry_data['data'] 
@@ -122,9 +133,9 @@ if coventry:
     print(f"\n5. Getting programs for {coventry.get('title')}...")
     try:
         coventry_slug = coventry.get('slug')
-        response = requests.get(
-            f"{API_BASE}/api/public/v1/{ORG_SLUG}/posts?post_type=programs&related_to_slug={coventry_slug}&relationship_type=university&per_page=5",
-            headers=headers
+        response = get(
+            "programs-by-university",
+            f"{API_BASE}/api/public/v1/{ORG_SLUG}/posts?post_type=programs&related_to_slug={coventry_slug}&relationship_type=university&per_page=5"
         )
         programs_data = response.json()
         if programs_data.get('success'):
@@ -144,7 +155,7 @@ print("\n6. Getting taxonomies...")
 taxonomy_slugs = ["disciplines", "program-disciplines", "categories", "program-categories"]
 for tax_slug in taxonomy_slugs:
     try:
-        response = requests.get(f"{API_BASE}/api/public/v1/{ORG_SLUG}/taxonomies/{tax_slug}", headers=headers)
+        response = get(f"taxonomy-{tax_slug}", f"{API_BASE}/api/public/v1/{ORG_SLUG}/taxonomies/{tax_slug}")
         if response.status_code == 200:
             tax_data = response.json()
             if tax_data.get('success'):
@@ -156,5 +167,12 @@ for tax_slug in taxonomy_slugs:
     except:
         continue
 
+# 7. Server-Timing summary
+print("\n7. Server-Timing per endpoint...")
+timing_summary = aggregate_timings(timing_samples)
+print_timing_summary(timing_summary)
+if timing_summary:
+    save_json("schema-query-timing.json", timing_summary)
+
 print("\n✅ Analysis complete!")
 
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Helpers for reading the API's Server-Timing / X-DB-Query-Count headers
+
+The Worker reports per-request D1 metrics as:
+    Server-Timing: db;dur=12.4;desc="7 queries", hydrate;dur=3.1, serialize;dur=0.8, total;dur=16.3
+    X-DB-Query-Count: 7
+"""
+import re
+import statistics
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+_DESC_COUNT = re.compile(r"^(\d+)\s+quer")
+
+
+def parse_server_timing(header):
+    """Parse a Server-Timing header into {metric: {"dur": float, "desc": str}}"""
+    metrics = {}
+    if not header:
+        return metrics
+
+    for entry in header.split(","):
+        parts = [p.strip() for p in entry.split(";") if p.strip()]
+        if not parts:
+            continue
+        name = parts[0]
+        metric = {}
+        for param in parts[1:]:
+            key, _, value = param.partition("=")
+            value = value.strip().strip('"')
+            if key.strip() == "dur":
+                try:
+                    metric["dur"] = float(value)
+                except ValueError:
+                    continue
+            else:
+                metric[key.strip()] = value
+        metrics[name] = metric
+    return metrics
+
+
+def timing_from_headers(headers):
+    """
+    Extract db/hydrate/serialize/total timings and the query count from
+    response headers. Returns None when the API did not report any.
+    """
+    metrics = parse_server_timing(headers.get("Server-Timing"))
+    if not metrics:
+        return None
+
+    query_count = headers.get(QUERY_COUNT_HEADER)
+    if query_count is not None:
+        query_count = int(query_count)
+    else:
+        match = _DESC_COUNT.match(metrics.get("db", {}).get("desc", ""))
+        query_count = int(match.group(1)) if match else None
+
+    return {
+        "db_queries": query_count,
+        "db_ms": metrics.get("db", {}).get("dur"),
+        "hydrate_ms": metrics.get("hydrate", {}).get("dur"),
+        "serialize_ms": metrics.get("serialize", {}).get("dur"),
+        "total_ms": metrics.get("total", {}).get("dur"),
+    }
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * pct / 100
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+
+def aggregate_timings(samples):
+    """
+    Aggregate timing dicts (from timing_from_headers) per endpoint name.
+
+    samples: iterable of (name, timing) pairs; timing may be None.
+    Returns {name: {"samples", "db_queries_max", "db_queries_mean", "<phase>_p50", "<phase>_p95"}}
+    """
+    grouped = {}
+    for name, timing in samples:
+        if timing:
+            grouped.setdefault(name, []).append(timing)
+
+    summary = {}
+    for name, timings in grouped.items():
+        counts = [t["db_queries"] for t in timings if t.get("db_queries") is not None]
+        row = {
+            "samples": len(timings),
+            "db_queries_max": max(counts) if counts else None,
+            "db_queries_mean": round(statistics.mean(counts), 2) if counts else None,
+        }
+        for phase in ("db_ms", "hydrate_ms", "serialize_ms", "total_ms"):
+            values = [t[phase] for t in timings if t.get(phase) is not None]
+            p50 = _percentile(values, 50)
+            p95 = _percentile(values, 95)
+            row[f"{phase}_p50"] = round(p50, 1) if p50 is not None else None
+            row[f"{phase}_p95"] = round(p95, 1) if p95 is not None else None
+        summary[name] = row
+    return summary
+
+
+def print_timing_summary(summary):
+    """Print an aggregated timing table"""
+    if not summary:
+        print("No Server-Timing headers reported")
+        return
+
+    print(f"{'Endpoint':<40} {'n':>3} {'queries':>8} {'db p50':>8} {'db p95':>8} {'total p95':>10}")
+    for name, row in summary.items():
+        def fmt(value):
+            return "-" if value is None else str(value)
+        print(
+            f"{name[:40]:<40} {row['samples']:>3} {fmt(row['db_queries_max']):>8} "
+            f"{fmt(row['db_ms_p50']):>8} {fmt(row['db_ms_p95']):>8} {fmt(row['total_ms_p95']):>10}"
+        )
@@ -6,6 +6,8 @@ import requests
 import json
 import sys
 
+from server_timing import timing_from_headers, aggregate_timings, print_timing_summary
+
 API_BASE = "https://omni-cms-api.joseph-9a2.workers.dev"
 API_KEY = "omni_099c139e8f5dce0edfc59cc9926d0cd7"
 ORG_SLUG = "study-in-kazakhstan"
@@ -40,8 +42,12 @@ def test_endpoint(name, url, headers):
             "has_data": "data" in data if isinstance(data, dict) else False,
             "data_count": len(data.get("data", [])) if isinstance(data, dict) and isinstance(data.get("data"), list) else (1 if data.get("data") else 0),
             "error": None,
+            "timing": timing_from_headers(response.headers),
             "raw_response": response.text[:500] if len(response.text) > 500 else response.text
         }
+        if result["timing"]:
+            t = result["timing"]
+            print(f"   Server-Timing: {t['db_queries']} queries, db {t['db_ms']}ms, total {t['total_ms']}ms")
         
         if status_code == 200:
             if isinstance(data, dict) and data.get("success"):
@@ -75,6 +81,7 @@ def test_endpoint(name, url, headers):
             "data_count": 0,
             "error": str(e),
             "status": "❌ FAILED",
+            "timing": None,
             "raw_response": None
         }
     except Exception as e:
@@ -88,6 +95,7 @@ def test_endpoint(name, url, headers):
             "data_count": 0,
             "error": str(e),
             "status": "❌ FAILED",
+            "timing": None,
             "raw_response": None
         }
 
@@ -170,6 +178,8 @@ for r in results:
     print(f"  Status Code: {r['status_code']}")
     print(f"  Success: {r['success']}")
     print(f"  Data Count: {r['data_count']}")
+    if r.get('timing'):
+        print(f"  DB Queries: {r['timing']['db_queries']} ({r['timing']['db_ms']}ms)")
     if r['error']:
         print(f"  Error: {r['error']}")
 
@@ -194,9 +204,18 @@ if partial_endpoints:
         if endpoint.get('raw_response'):
             print(f"    Response: {endpoint['raw_response'][:300]}")
 
+# Server-Timing summary
+print("\n⏱️ SERVER TIMING:")
+timing_summary = aggregate_timings((r["name"], r.get("timing")) for r in results)
+print_timing_summary(timing_summary)
+
 # Save results to file
 with open("docs/api/study-in-kazakhstan/endpoint-test-results.json", "w") as f:
     json.dump(results, f, indent=2)
 
+with open("docs/api/study-in-kazakhstan/endpoint-timing-summary.json", "w") as f:
+    json.dump(timing_summary, f, indent=2)
+
 print("\n✅ Results saved to docs/api/study-in-kazakhstan/endpoint-test-results.json")
+print("✅ Timing summary saved to docs/api/study-in-kazakhstan/endpoint-timing-summary.json")
 